@@ -1,17 +1,40 @@
 from __future__ import annotations
 
+from importlib import import_module
+
 from django.apps import AppConfig, apps
 from django.core.checks import Error, Warning, register
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.functional import cached_property
 
 
 class TextConfig(AppConfig):
     name = "djangocms_text"
     verbose_name = "django CMS Rich Text"
     default_auto_field = "django.db.models.BigAutoField"
-    inline_models: dict[str, str] = {}
+
+    @cached_property
+    def inline_models(self) -> dict[str, str]:
+        """Frontend-editable fields, discovered on first use (or read from the module generated by the
+        ``text_inline_models`` management command if ``TEXT_INLINE_MODELS_MODULE`` is set)."""
+        from .settings import TEXT_INLINE_MODELS_MODULE
+
+        if TEXT_INLINE_MODELS_MODULE:
+            try:
+                return import_module(TEXT_INLINE_MODELS_MODULE).INLINE_MODELS
+            except (ImportError, AttributeError) as e:
+                raise ImproperlyConfigured(
+                    f"TEXT_INLINE_MODELS_MODULE: Cannot read INLINE_MODELS from {TEXT_INLINE_MODELS_MODULE!r} ({e}). "
+                    "Generate the module with the text_inline_models management command."
+                ) from e
+        return discover_inline_editable_models()
 
     def ready(self):
-        self.inline_models = discover_inline_editable_models()
+        register_link_providers()
+        if apps.is_installed("cms"):
+            from .signals import connect_link_snapshot_signals
+
+            connect_link_snapshot_signals()
         register(check_ckeditor_settings)
         register(check_no_cms_config)
 
@@ -60,6 +83,15 @@ def discover_inline_editable_models(blacklist_apps: list[str] | None = None) ->
     return inline_models
 
 
+def register_link_providers() -> None:
+    # Register the link providers configured in the settings
+    from . import links
+    from .settings import TEXT_LINK_PROVIDERS
+
+    for provider in TEXT_LINK_PROVIDERS:
+        links.register(provider if isinstance(provider, links.LinkProvider) else links.LinkProvider(**provider))
+
+
 def check_ckeditor_settings(app_configs, **kwargs) -> list:  # pragma: no cover
     from django.conf import settings
 
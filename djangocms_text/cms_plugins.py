@@ -1,17 +1,23 @@
 import json
 import operator
-import re
+import threading
+from collections import defaultdict
 from functools import lru_cache
 
-from cms.models import CMSPlugin, Page
+from cms.models import CMSPlugin, Page, Placeholder
 from cms.utils import get_language_from_request
 from django.apps import apps
-from django.contrib.admin.utils import unquote
+from django.contrib.admin.utils import flatten_fieldsets, unquote
 from django.contrib.messages import get_messages
 from django.core import signing
+from django.core.cache import cache
 from django.core.exceptions import FieldError, PermissionDenied, ValidationError
+from django.core.signals import setting_changed
 from django.db import transaction
-from django.forms.fields import CharField
+from django.db.models import Case, Value, When
+from django.dispatch import receiver
+from django.forms.fields import CharField, IntegerField
+from django.forms.widgets import HiddenInput
 from django.http import (
     Http404,
     HttpResponse,
@@ -23,9 +29,11 @@ from django.http import (
 from django.shortcuts import get_object_or_404
 from django.template import RequestContext
 from django.urls import re_path, reverse
+from django.utils.cache import get_conditional_response, patch_cache_control
 from django.utils.decorators import method_decorator
 from django.utils.encoding import force_str
-from django.utils.translation import gettext, override
+from django.utils.http import quote_etag
+from django.utils.translation import get_language, gettext, override
 from django.views.decorators.clickjacking import xframe_options_sameorigin
 from django.views.decorators.http import require_POST
 
@@ -48,12 +56,16 @@ from cms.utils.urlutils import admin_reverse
 from . import settings
 from .editors import get_editor_config
 from .forms import ActionTokenValidationForm, RenderPluginForm, TextForm
-from .html import render_dynamic_attributes
-from .models import _MAX_RTE_LENGTH, Text
+from .html import get_plugin_node_types, render_dynamic_attributes
+from .links import can_view_model, get_link_provider, search_link_providers
+from .models import _MAX_RTE_LENGTH, Text, TextVersionConflict
+from .signals import get_link_snapshot_version
 from .utils import (
-    OBJ_ADMIN_WITH_CONTENT_RE_PATTERN,
+    OBJ_ADMIN_WITH_CONTENT_RE,
     _plugin_tags_to_html,
+    _render_cms_plugin,
     cms_placeholder_add_plugin,
+    get_plugins_from_texts,
     plugin_tags_to_admin_html,
     plugin_tags_to_id_list,
     plugin_tags_to_user_html,
@@ -82,11 +94,10 @@ def post_add_plugin(operation, **kwargs):
     new_plugins = get_bound_plugins(new_plugins)
 
     # Extend the recorded added plugins to include the inline plugins (if any)
-    action = operation.actions.only("post_action_data").get(action=ADD_PLUGIN, order=1)
-    post_data = json.loads(action.post_action_data)
+    actions = operation.actions.filter(action=ADD_PLUGIN, order=1)
+    post_data = json.loads(actions.values_list("post_action_data", flat=True).get())
     post_data["plugins"].extend(get_plugin_data(plugin) for plugin in new_plugins)
-    action.post_action_data = dump_json(post_data)
-    action.save(update_fields=["post_action_data"])
+    actions.update(post_action_data=dump_json(post_data))
 
 
 def pre_change_plugin(operation, **kwargs):
@@ -112,16 +123,14 @@ def pre_change_plugin(operation, **kwargs):
     # This app is a special case.
     # We know the old and new tree orders because inline plugins
     # have already been set on the database when this pre operation
-    # is executed.
-    old_tree = (
-        old_text_plugin.cmsplugin_set.filter(pk__in=old_plugin_ids).order_by("position").values_list("pk", flat=True)
+    # is executed. Both trees are read with one query.
+    tree = list(
+        old_text_plugin.cmsplugin_set.filter(pk__in=old_plugin_ids | new_plugin_ids)
+        .order_by("position")
+        .values_list("pk", flat=True)
     )
-    old_tree = list(old_tree)
-
-    new_tree = (
-        new_text_plugin.cmsplugin_set.filter(pk__in=new_plugin_ids).order_by("position").values_list("pk", flat=True)
-    )
-    new_tree = list(new_tree)
+    old_tree = [pk for pk in tree if pk in old_plugin_ids]
+    new_tree = [pk for pk in tree if pk in new_plugin_ids]
 
     plugins = CMSPlugin.objects.filter(pk__in=plugin_ids)
     bound_plugins = list(get_bound_plugins(plugins))
@@ -177,6 +186,52 @@ def pre_change_plugin(operation, **kwargs):
         )
 
 
+@lru_cache(maxsize=256)
+def _get_static_body_css_classes(plugin_types: tuple[str, ...], css_classes: str = "") -> str:
+    # Body css classes of a parent chain of plugins without get_child_ckeditor_body_css_class
+    collected = css_classes
+    for plugin_type in plugin_types:
+        body_css_class = getattr(plugin_pool.plugins.get(plugin_type), "child_ckeditor_body_css_class", "")
+        if body_css_class and body_css_class not in collected:
+            collected += " " + body_css_class
+    return collected[len(css_classes) :]
+
+
+_CHILD_PLUGIN_MENU_CACHE_SIZE = 256
+_child_plugin_menus: dict[tuple, list[dict]] = {}
+_child_plugin_menus_lock = threading.Lock()
+
+
+@receiver(setting_changed)
+def clear_child_plugin_menus(setting=None, **kwargs):
+    """Clears the cached child plugin menus if the placeholder configuration changes."""
+    if setting in (None, "CMS_PLACEHOLDER_CONF"):
+        with _child_plugin_menus_lock:
+            _child_plugin_menus.clear()
+        _get_static_body_css_classes.cache_clear()
+        TextPlugin.get_child_plugin_candidates.cache_clear()
+
+
+def _get_parent_plugins(plugin: CMSPlugin) -> list[CMSPlugin]:
+    """
+    Returns the parent chain of a plugin, nearest parent first.
+    """
+    get_ancestors = getattr(plugin, "get_ancestors", None)
+    if get_ancestors is not None:
+        # One query for the whole parent chain
+        return list(get_ancestors())[::-1]
+    # No plugin tree methods (e.g., django CMS 4.0): walk the parent ids of the placeholder's plugins
+    # and fetch the parents with a second query
+    parent_ids = dict(CMSPlugin.objects.filter(placeholder_id=plugin.placeholder_id).values_list("pk", "parent_id"))
+    chain = []
+    parent_id = plugin.parent_id
+    while parent_id and parent_id not in chain:
+        chain.append(parent_id)
+        parent_id = parent_ids.get(parent_id)
+    parents = CMSPlugin.objects.in_bulk(chain)
+    return [parents[pk] for pk in chain if pk in parents]
+
+
 class TextPlugin(CMSPluginBase):
     model = Text
     name = settings.TEXT_PLUGIN_NAME
@@ -186,7 +241,7 @@ class TextPlugin(CMSPluginBase):
     inline_editing_template = "cms/plugins/inline.html"
     editor_configuration = settings.TEXT_CONFIGURATION
     disable_child_plugins = True
-    fieldsets = ((None, {"fields": ("body", "json")}),)
+    fieldsets = ((None, {"fields": ("body", "json", "version")}),)
 
     class Media:
         css = {"all": ("djangocms_text/css/cms.normalize.css",)}
@@ -200,30 +255,83 @@ class TextPlugin(CMSPluginBase):
 
     @classmethod
     def do_post_copy(cls, instance, source_map):
-        ids = plugin_tags_to_id_list(instance.body)
-        ids_map = {pk: source_map[pk].pk for pk in ids if pk in source_map}
-        new_text = replace_plugin_tags(instance.body, ids_map)
-        cls.model.objects.filter(pk=instance.pk).update(body=new_text)
+        """
+        Fix the references to child plugins of a copied text plugin. ``source_map`` maps the source
+        plugin ids to the new plugins which are already in memory, so no query is needed to remap them.
+        """
+        copied_ids = [pk for pk in plugin_tags_to_id_list(instance.body) if pk in source_map]
+        if copied_ids:
+            instance._replace_plugin_ids(
+                instance.body,
+                {pk: source_map[pk].pk for pk in copied_ids},
+                plugins_by_id={source_map[pk].pk: source_map[pk] for pk in copied_ids},
+            )
+
+    @classmethod
+    def do_post_copy_in_bulk(cls, instances, source_map):
+        """
+        Bulk version of :meth:`do_post_copy` for all text plugins copied in one operation, e.g., a whole
+        placeholder: the ids are remapped in memory and all bodies are written with one bulk update.
+
+        django CMS calls :meth:`do_post_copy` for each copied plugin. Code which copies plugins itself
+        (e.g., imports or copies between languages) and has the ``source_map`` of the whole operation
+        calls this method with all copied text plugins instead.
+        """
+        updated = []
+        for instance in instances:
+            copied_ids = [pk for pk in plugin_tags_to_id_list(instance.body) if pk in source_map]
+            if not copied_ids:
+                continue
+            instance.body = replace_plugin_tags(
+                instance.body,
+                {pk: source_map[pk].pk for pk in copied_ids},
+                plugins_by_id={source_map[pk].pk: source_map[pk] for pk in copied_ids},
+            )
+            if instance._versioned:
+                instance.version += 1
+            updated.append(instance)
+        if updated:
+            cls.model.objects.bulk_update(updated, ["body", "version"] if cls.model._versioned else ["body"])
 
     @staticmethod
     def get_translation_export_content(field, plugin_data):
-        def _render_plugin_with_content(obj, match):
-            from djangocms_translations.utils import get_text_field_child_label
+        return TextPlugin.get_translation_export_contents(field, [plugin_data])[0]
+
+    @staticmethod
+    def get_translation_export_contents(field, plugin_data_list):
+        """
+        Bulk version of :meth:`get_translation_export_content`: returns a ``(content, subplugin ids)``
+        pair for each item of ``plugin_data_list``. The child plugins of all texts are fetched together.
+        """
+        from djangocms_translations.utils import get_text_field_child_label
 
-            field = get_text_field_child_label(obj.plugin_type)
-            content = getattr(obj, field) if field else ""
+        texts = [plugin_data[field] for plugin_data in plugin_data_list]
+        child_plugins = get_plugins_from_texts(texts)
+        rendered_ids = []
+
+        def _render_plugin_with_content(obj, match):
+            rendered_ids.append(obj.pk)
+            child_field = get_text_field_child_label(obj.plugin_type)
+            content = getattr(obj, child_field) if child_field else ""
             return plugin_to_tag(obj, content)
 
-        content = _plugin_tags_to_html(plugin_data[field], output_func=_render_plugin_with_content)
-        subplugins_within_this_content = plugin_tags_to_id_list(content)
-        return content, subplugins_within_this_content
+        results = []
+        for text in texts:
+            start = len(rendered_ids)
+            content = _plugin_tags_to_html(
+                text, output_func=_render_plugin_with_content, child_plugin_instances=child_plugins
+            )
+            results.append((content, rendered_ids[start:]))
+        return results
 
     @staticmethod
     def set_translation_import_content(content, plugin):
-        data = [x.groups() for x in re.finditer(OBJ_ADMIN_WITH_CONTENT_RE_PATTERN, content)]
-        data = {int(pk): value for pk, value in data}
+        return {int(match["pk"]): match["content"] for match in OBJ_ADMIN_WITH_CONTENT_RE.finditer(content)}
 
-        return {subplugin_id: data[subplugin_id] for subplugin_id in plugin_tags_to_id_list(content)}
+    @staticmethod
+    def set_translation_import_contents(contents):
+        """Bulk version of :meth:`set_translation_import_content` for a list of ``(content, plugin)`` pairs."""
+        return [TextPlugin.set_translation_import_content(content, plugin) for content, plugin in contents]
 
     def get_editor_widget(self, request, plugins, plugin):
         """
@@ -283,29 +391,26 @@ class TextPlugin(CMSPluginBase):
         css_classes: str = "",
     ) -> str:
         """
-        Recursion that collects CMSPluginBase.child_ckeditor_body_css_class attribute values,
+        Collects CMSPluginBase.child_ckeditor_body_css_class attribute values of all parent plugins,
         it allows to style content within WYSIWYG iframe <body> based on its parent plugins.
         """
-        parent_current = plugin_instance.parent
-        if parent_current:
-            for plugin_name, plugin_class in plugin_pool.plugins.items():
-                is_current_parent_found = plugin_name == parent_current.plugin_type
-                if is_current_parent_found:
-                    body_css_class = ""
-                    if getattr(plugin_class, "child_ckeditor_body_css_class", False):
-                        body_css_class = plugin_class.child_ckeditor_body_css_class
-                    if getattr(plugin_class, "get_child_ckeditor_body_css_class", False):
-                        body_css_class = plugin_class.get_child_ckeditor_body_css_class(parent_current)
-
-                    if body_css_class and (body_css_class not in css_classes):
-                        css_classes += " " + body_css_class
-
-            css_classes_collected = self._get_body_css_classes_from_parent_plugins(
-                parent_current,
-                css_classes,
-            )
-            if css_classes_collected not in css_classes:
-                css_classes += css_classes_collected
+        if not plugin_instance.parent_id:
+            return css_classes
+        parents = _get_parent_plugins(plugin_instance)
+        plugin_types = tuple(parent.plugin_type for parent in parents)
+        if not any(
+            getattr(plugin_pool.plugins.get(plugin_type), "get_child_ckeditor_body_css_class", False)
+            for plugin_type in plugin_types
+        ):
+            # The classes only depend on the plugin types of the parents
+            return css_classes + _get_static_body_css_classes(plugin_types, css_classes)
+        for parent in parents:
+            plugin_class = plugin_pool.plugins.get(parent.plugin_type)
+            body_css_class = getattr(plugin_class, "child_ckeditor_body_css_class", "")
+            if getattr(plugin_class, "get_child_ckeditor_body_css_class", False):
+                body_css_class = plugin_class.get_child_ckeditor_body_css_class(parent)
+            if body_css_class and body_css_class not in css_classes:
+                css_classes += " " + body_css_class
         return css_classes
 
     def get_form_class(self, request, plugins, plugin):
@@ -320,7 +425,16 @@ class TextPlugin(CMSPluginBase):
 
         instance = plugin.get_plugin_instance()[0] if plugin else None
 
-        if instance:
+        if instance and settings.TEXT_LAZY_CHILD_PREVIEWS and rte_config.name == "tiptap":
+            # Ship empty <cms-plugin> tags: the editor fetches all previews in one request after loading.
+            # Other editors do not fetch previews and get them rendered.
+            node_types = get_plugin_node_types(instance.body)
+            rendered_text = _plugin_tags_to_html(
+                instance.body,
+                output_func=lambda obj, match: plugin_to_tag(obj, admin=True, node=node_types.get(obj.pk)),
+                child_plugin_instances=instance.child_plugin_instances,
+            )
+        elif instance:
             context = RequestContext(request)
             context["request"] = request
             rendered_text = plugin_tags_to_admin_html(
@@ -334,14 +448,44 @@ class TextPlugin(CMSPluginBase):
         # We avoid mutating the Form declared above by subclassing
         class TextPluginForm(self.form):
             body = CharField(widget=widget, required=False)
+            body_patch = CharField(widget=HiddenInput, required=False)
+            version = IntegerField(widget=HiddenInput, required=False)
 
             def __init__(self, *args, **kwargs):
                 initial = kwargs.pop("initial", {})
 
                 if rendered_text:
                     initial["body"] = rendered_text
+                if instance and instance._versioned:
+                    # Not editable, hence not part of the model's initial data: the modal editor
+                    # sends the version it was opened with, so that clean() detects concurrent saves
+                    initial["version"] = instance.version
                 super().__init__(*args, initial=initial, **kwargs)
 
+            def clean(self):
+                cleaned_data = super().clean()
+                version = cleaned_data.get("version")
+                if (
+                    version is not None
+                    and self.instance.pk
+                    and self.instance._versioned
+                    and version != self.instance.version
+                ):
+                    raise ValidationError(
+                        {"body": gettext("The text has been changed in the meantime. Reload to see the changes.")}
+                    )
+                if cleaned_data.get("body_patch"):
+                    try:
+                        if not settings.TEXT_INLINE_PATCH_SAVE:
+                            raise ValueError("Patches are disabled")
+                        self.plugins_changed = self.instance.apply_body_patch(json.loads(cleaned_data["body_patch"]))
+                    except (KeyError, TypeError, ValueError) as e:
+                        # change_view() answers 409 so that the editor sends the whole text instead
+                        raise ValidationError({"body": ValidationError(force_str(e), code="body_patch")}) from e
+                    cleaned_data["body"] = self.instance.body
+                    cleaned_data["json"] = self.instance.json
+                return cleaned_data
+
         return TextPluginForm
 
     @staticmethod
@@ -431,44 +575,78 @@ class TextPlugin(CMSPluginBase):
         url_name = f"{self.model._meta.app_label}_{plugin_type}_{name}"
         return url_name
 
-    def _get_text_plugin_from_request(self, request, data):
+    def _get_action_token_data(self, request, data):
         if not (request.user.is_active and request.user.is_staff):
             raise PermissionDenied
 
         form = ActionTokenValidationForm(data)
         if form.is_valid():
             session_key = request.session.session_key
-            text_plugin_id = form.get_id_from_token(session_key)
+            token_data = form.get_token_data(session_key)
 
-            if text_plugin_id:
-                return self._get_plugin_or_404(text_plugin_id)
+            if token_data:
+                return token_data
 
         message = gettext("Unable to process your request. Invalid token.")
         raise ValidationError(message=force_str(message))
 
+    def _get_text_plugin_from_request(self, request, data):
+        text_plugin_id, _ = self._get_action_token_data(request, data)
+        return self._get_plugin_or_404(text_plugin_id)
+
     @random_comment_exempt
     @xframe_options_sameorigin
     def render_plugin(self, request):
         try:
-            text_plugin = self._get_text_plugin_from_request(request, data=request.GET)
+            text_plugin_id, placeholder_id = self._get_action_token_data(request, data=request.GET)
         except ValidationError as error:
             return HttpResponseBadRequest(error.message)
 
+        # The token carries the placeholder: only it is needed for the permission check,
+        # the text plugin itself is not fetched.
+        placeholder = get_object_or_404(Placeholder, pk=placeholder_id)
+        self._check_render_permission(request, placeholder)
+        text_plugin = CMSPlugin(pk=text_plugin_id, placeholder=placeholder)
+
+        if "plugins" in request.GET:
+            return self._render_plugins(request, text_plugin)
+
         form = RenderPluginForm(request.GET, text_plugin=text_plugin)
         if not form.is_valid():
             # plugin not found, inform CKEDITOR.plugins.insertPlugin to remove it
             return HttpResponse(status=204)
 
-        plugin_class = text_plugin.get_plugin_class_instance()
+        return HttpResponse(form.render_plugin(request))
+
+    def _check_render_permission(self, request, placeholder):
+        plugin_class = type(self)(self.model, None)
         # The following is needed for permission checking
         plugin_class.opts = plugin_class.model._meta
 
-        if not (
-            plugin_class.has_change_permission(request, obj=text_plugin)
-            and text_plugin.placeholder.has_change_permission(request.user)
-        ):
+        if not (plugin_class.has_change_permission(request) and placeholder.has_change_permission(request.user)):
             raise PermissionDenied
-        return HttpResponse(form.render_plugin(request))
+
+    def _render_plugins(self, request, text_plugin):
+        # Batch preview: ?plugins=1,2,3 renders several child plugins of the text plugin in one request.
+        # Plugins which are not children of the text plugin are left out of the response.
+        try:
+            plugin_ids = {int(pk) for pks in request.GET.getlist("plugins") for pk in pks.split(",") if pk}
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        context = RequestContext(request)
+        context["request"] = request
+        children = CMSPlugin.objects.filter(
+            parent_id=text_plugin.pk, placeholder_id=text_plugin.placeholder_id, pk__in=plugin_ids
+        )
+        return JsonResponse(
+            {
+                "plugins": {
+                    plugin.pk: plugin_to_tag(plugin, content=_render_cms_plugin(plugin, context), admin=True)
+                    for plugin in children
+                }
+            }
+        )
 
     @method_decorator(require_POST)
     @xframe_options_sameorigin
@@ -513,12 +691,23 @@ class TextPlugin(CMSPluginBase):
         if not (request.user.is_active and request.user.is_staff and request.user.has_perm(permission)):
             raise PermissionDenied
 
+        if "refs" in request.GET:
+            # Get names of many references at once, e.g. ?refs=cms.page:1,cms.page:2
+            references = [ref for refs in request.GET.getlist("refs") for ref in refs.split(",") if ref]
+            return JsonResponse({"results": self._resolve_references(request, references)})
+
         if request.GET.get("g"):
             # Get name of a reference
             try:
                 model, pk = request.GET.get("g").split(":")
                 app, model = model.split(".")
-                model = apps.get_model(app, model)
+                provider = get_link_provider(f"{app}.{model}")
+                model = provider.model if provider is not None else apps.get_model(app, model)
+                if not can_view_model(request.user, model):
+                    return JsonResponse({"error": gettext("Permission denied")})
+                if provider is not None:
+                    obj = provider.get_queryset(admin_objects=True).get(pk=pk)
+                    return JsonResponse({"text": provider.get_text(obj), "url": provider.get_url(obj)})
                 obj = model.objects.get(pk=pk)
                 if isinstance(obj, Page) and _version >= 4:
                     obj = obj.pagecontent_set(manager="admin_manager").current_content().first()
@@ -529,26 +718,101 @@ class TextPlugin(CMSPluginBase):
 
         search = request.GET.get("q", "").strip("  ").lower()
         language = get_language_from_request(request)
-        if _version >= 4:
-            try:
-                # django CMS 4.2+
-                qs = list(
-                    PageContent.admin_manager.filter(language=language, title__icontains=search)
-                    .current_content()
-                    .order_by("page__path")
-                )
-            except FieldError:
-                # django CMS 4.0 - 4.1
-                qs = list(
-                    PageContent.admin_manager.filter(language=language, title__icontains=search)
-                    .current_content()
-                    .order_by("page__node__path")
-                )
-        else:
-            # django CMS 3
-            qs = list(
-                PageContent.objects.filter(language=language, title__icontains=search).order_by("page__node__path")
+        try:
+            page = max(int(request.GET.get("page", 1)), 1)
+            limit = min(
+                max(int(request.GET.get("limit", settings.TEXT_LINK_PAGE_SIZE)), 1), settings.TEXT_LINK_PAGE_SIZE
             )
+        except ValueError:
+            return HttpResponseBadRequest()
+
+        if search:
+            urls = self._get_page_links(language, search, page, limit)
+            groups, more = search_link_providers(
+                search, (page - 1) * limit, limit, budget=settings.TEXT_LINK_SEARCH_BUDGET, user=request.user
+            )
+            urls["results"] += groups
+            urls["pagination"]["more"] |= more
+            return JsonResponse(urls)
+
+        # The unfiltered page tree is the same for all editors: serve it from a versioned snapshot which
+        # is invalidated when pages change (see signals.py), and let browsers revalidate it by ETag.
+        snapshot = f"{get_link_snapshot_version()}-{language}-{page}-{limit}"
+        etag = quote_etag(snapshot)
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            cache_key = f"djangocms_text:links:{snapshot}"
+            urls = cache.get(cache_key)
+            if urls is None:
+                urls = self._get_page_links(language, search, page, limit)
+                cache.set(cache_key, urls, timeout=settings.TEXT_LINK_CACHE_TIMEOUT)
+            response = JsonResponse(urls)
+        response["ETag"] = etag
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    def _resolve_references(self, request, references: list[str]) -> dict:
+        """
+        Resolves many ``app.model:pk`` references with one query per model. Permissions are checked once per model.
+        """
+        results = {}
+        language = get_language_from_request(request)
+        requested = defaultdict(dict)
+        for reference in references:
+            model, sep, pk = reference.rpartition(":")
+            if sep and model:
+                requested[model.strip().lower()][pk] = reference
+            else:
+                results[reference] = {"error": gettext("Invalid reference")}
+
+        for label, raw_refs in requested.items():
+            try:
+                model = apps.get_model(label)
+            except (LookupError, ValueError) as e:
+                results.update({reference: {"error": str(e)} for reference in raw_refs.values()})
+                continue
+            if not can_view_model(request.user, model):
+                results.update({reference: {"error": gettext("Permission denied")} for reference in raw_refs.values()})
+                continue
+            # Primary keys are not necessarily integers (e.g., UUIDs): convert them like the model field does
+            refs = {}
+            for pk, reference in raw_refs.items():
+                try:
+                    refs[model._meta.pk.to_python(pk)] = reference
+                except ValidationError:
+                    results[reference] = {"error": gettext("Invalid reference")}
+            provider = get_link_provider(label)
+            if provider is not None:
+                objects = provider.resolve(refs, admin_objects=True)
+                get_text, get_url = provider.get_text, provider.get_url
+            elif model is Page and _version >= 4:
+                objects = {}
+                for content in PageContent.admin_manager.current_content().filter(page__in=refs).select_related("page"):
+                    # Prefer the current language, but fall back to any existing translation
+                    if content.page_id not in objects or content.language == language:
+                        objects[content.page_id] = content
+                get_text, get_url = operator.attrgetter("title"), operator.methodcaller("get_absolute_url")
+            else:
+                manager = model.admin_manager if hasattr(model, "admin_manager") else model.objects
+                queryset = manager.all()
+                if model is Page:  # up to CMS v3.11: str() and get_absolute_url() read the page's titles
+                    queryset = queryset.prefetch_related("title_set")
+                objects = queryset.in_bulk(refs)
+                get_text, get_url = str, lambda obj: obj.get_absolute_url() if hasattr(obj, "get_absolute_url") else ""
+            for pk, reference in refs.items():
+                if pk in objects:
+                    results[reference] = {"text": get_text(objects[pk]), "url": get_url(objects[pk])}
+                else:
+                    results[reference] = {"error": gettext("Reference not found")}
+        return results
+
+    def _get_page_links(self, language, search, page, limit):
+        # Fetch one more than needed to know if there are more results
+        offset = (page - 1) * limit
+        qs = list(self._get_page_contents(language, search)[offset : offset + limit + 1])
+        more = len(qs) > limit
+        qs = qs[:limit]
+        if _version < 4:
             for page_content in qs:
                 # Patch the missing get_absolute_url method. Binding the page's own method
                 # rather than wrapping it in a lambda: a lambda would close over the loop
@@ -570,9 +834,35 @@ class TextPlugin(CMSPluginBase):
                         for page_content in qs
                     ],
                 }
-            ]
+            ],
+            "pagination": {"more": more},
         }
-        return JsonResponse(urls)
+        return urls
+
+    @staticmethod
+    def _get_page_contents(language, search):
+        """
+        Return the page contents matching ``search`` ordered by the page tree. Titles starting with
+        the search term come first, so the best matches are on the first page of paginated results.
+        """
+        if _version >= 4:
+            qs = PageContent.admin_manager.filter(language=language, title__icontains=search).current_content()
+            try:
+                # django CMS 4.2+
+                qs = qs.select_related("page").order_by("page__path")
+                tree_ordering = "page__path"
+            except FieldError:
+                # django CMS 4.0 - 4.1
+                qs = qs.select_related("page__node")
+                tree_ordering = "page__node__path"
+        else:
+            # django CMS 3
+            qs = PageContent.objects.filter(language=language, title__icontains=search).select_related("page__node")
+            tree_ordering = "page__node__path"
+        if search:
+            prefix_match = Case(When(title__istartswith=search, then=Value(0)), default=Value(1))
+            return qs.annotate(prefix_match=prefix_match).order_by("prefix_match", tree_ordering, "pk")
+        return qs.order_by(tree_ordering, "pk")
 
     def get_messages(self, request):
         """Serve the messages that the admin might have started piling"""
@@ -629,17 +919,43 @@ class TextPlugin(CMSPluginBase):
         plugin = getattr(self, "cms_plugin_instance", None) or obj
         if not plugin or not TEXT_CHILDREN_ENABLED or not rte_config.child_plugin_support:
             return []
-        get_plugin = plugin_pool.get_plugin
         page = self.placeholder.page if hasattr(self.placeholder, "page") else None
+        if hasattr(self, "_get_template_for_conf"):
+            template = self._get_template_for_conf(page, None)
+        else:  # django CMS 3.11 and 4.1.0
+            template = page.get_template() if page is not None else None
+        # The menu only depends on the slot, the template, the language (for the labels) and the
+        # registered plugins. The key includes the registered plugin names so that changes to
+        # the plugin pool are not served from a stale menu.
+        key = (
+            self.__class__.__name__,
+            plugin.placeholder.slot,
+            type(page),
+            force_str(template or ""),
+            get_language(),
+            tuple(plugin_pool.plugins),
+        )
+        menu = _child_plugin_menus.get(key)
+        if menu is None:
+            menu = self._get_child_plugin_menu(plugin.placeholder.slot, page)
+            with _child_plugin_menus_lock:
+                if len(_child_plugin_menus) >= _CHILD_PLUGIN_MENU_CACHE_SIZE:
+                    # Evict the oldest entry
+                    _child_plugin_menus.pop(next(iter(_child_plugin_menus), None), None)
+                _child_plugin_menus[key] = menu
+        return [entry.copy() for entry in menu]
+
+    def _get_child_plugin_menu(self, slot, page):
+        get_plugin = plugin_pool.get_plugin
         child_plugin_types = self.get_child_classes(
-            slot=plugin.placeholder.slot,
+            slot=slot,
             page=page,
         )
         child_plugins = (get_plugin(name) for name in child_plugin_types)
         template = getattr(page, "template", None)
 
-        modules = get_placeholder_conf("plugin_modules", plugin.placeholder.slot, template, default={})
-        names = get_placeholder_conf("plugin_labels", plugin.placeholder.slot, template, default={})
+        modules = get_placeholder_conf("plugin_modules", slot, template, default={})
+        names = get_placeholder_conf("plugin_labels", slot, template, default={})
         main_list = []
 
         # plugin.value points to the class name of the plugin
@@ -648,9 +964,9 @@ class TextPlugin(CMSPluginBase):
             main_list.append(
                 {
                     "value": plugin.value,
-                    "name": names.get(plugin.value, plugin.name),
+                    "name": force_str(names.get(plugin.value, plugin.name)),
                     "icon": self.render_plugin_icon(plugin),
-                    "module": modules.get(plugin.value, plugin.module),
+                    "module": force_str(modules.get(plugin.value, plugin.module)),
                 }
             )
         return sorted(main_list, key=operator.itemgetter("module"))
@@ -664,6 +980,11 @@ class TextPlugin(CMSPluginBase):
             plugin=plugin,
         )
         kwargs["form"] = form  # override standard form
+        fields = kwargs["fields"] if "fields" in kwargs else flatten_fieldsets(self.get_fieldsets(request, obj))
+        if fields is not None:
+            # The hidden version is rendered with the fieldsets, but is a form-only field for the model form
+            non_editable = {field.name for field in self.model._meta.fields if not field.editable}
+            kwargs["fields"] = [field for field in fields if field not in non_editable]
         return super().get_form(request, obj, **kwargs)
 
     def get_render_template(self, context, instance, placeholder):
@@ -688,6 +1009,8 @@ class TextPlugin(CMSPluginBase):
             with override(request.toolbar.toolbar_language):
                 widget = self.get_editor_widget(context["request"], self.get_plugins(instance), instance)
                 editor_settings = widget.get_editor_settings(request.toolbar.toolbar_language.split("-")[0])
+                # Sent back with inline saves to detect concurrent changes
+                editor_settings["version"] = instance.get_body_version()
                 global_settings = widget.get_global_settings(request.toolbar.toolbar_language.split("-")[0])
 
             body = render_dynamic_attributes(instance.body, admin_objects=True, remove_attr=False)
@@ -733,6 +1056,9 @@ class TextPlugin(CMSPluginBase):
                 setattr(obj, field.name, value)
         obj.rte = rte_config.name[:_MAX_RTE_LENGTH]
         super().save_model(request, obj, form, change)
+        if not getattr(form, "plugins_changed", True):
+            # An inline patch which neither added nor removed child plugins
+            return
         # This must come after calling save
         # If `clean_plugins()` deletes child plugins, django-treebeard will call
         # save() again on the Text instance (aka obj in this context) to update mptt values (numchild, etc).
@@ -740,14 +1066,38 @@ class TextPlugin(CMSPluginBase):
         obj.clean_plugins()
         obj.copy_referenced_plugins()
 
+    def change_view(self, request, object_id, form_url="", extra_context=None):
+        try:
+            response = super().change_view(request, object_id, form_url=form_url, extra_context=extra_context)
+        except TextVersionConflict:
+            # Saved by someone else after this request loaded the text
+            self._operation_token = None
+            return HttpResponse(
+                gettext("The text has been changed in the meantime. Reload to see the changes."), status=409
+            )
+        adminform = (getattr(response, "context_data", None) or {}).get("adminform")
+        if adminform is not None and adminform.form.has_error("body", code="body_patch"):
+            # The editor sends the whole text instead
+            return HttpResponse(status=409)
+        return response
+
+    def response_change(self, request, obj):
+        response = super().response_change(request, obj)
+        # The editor sends the version with the next inline save (and bases patches on it)
+        response["X-Text-Version"] = obj.get_body_version()
+        if settings.TEXT_INLINE_PATCH_SAVE:
+            response["X-Text-Patch-Save"] = "true"
+        return response
+
     @staticmethod
     def get_action_token(request, obj):
         if not obj:
             return ""
-        plugin_id = force_str(obj.pk)
+        # The placeholder is encoded so that previews can check permissions without fetching the plugin
+        value = f"{force_str(obj.pk)}:{force_str(obj.placeholder_id)}"
         # salt is different for every user
-        signer = signing.Signer(salt=request.session.session_key)
-        return signer.sign(plugin_id)
+        signer = signing.TimestampSigner(salt=request.session.session_key)
+        return signer.sign(value)
 
     def _get_plugin_or_404(self, pk):
         plugin_type = self.__class__.__name__
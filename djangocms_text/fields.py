@@ -1,15 +1,173 @@
+from __future__ import annotations
+
 from django.contrib.admin import widgets as admin_widgets
 from django.db import models
+from django.db.models.query_utils import DeferredAttribute
 from django.forms.fields import CharField
-from django.utils.safestring import mark_safe
+from django.utils.safestring import SafeString, mark_safe
 
-from .html import clean_html, render_dynamic_attributes
+from .html import (
+    SanitizedHTML,
+    clean_html,
+    get_data_from_db,
+    get_dynamic_references,
+    is_sanitized,
+    render_dynamic_attributes,
+)
 from .widgets import TextEditorWidget
 
 
 def sanitize_and_mark_safe(value):
     """Sanitize HTML immediately before marking it safe for templates."""
-    return mark_safe(clean_html(value))
+    if is_sanitized(value):
+        return value
+    return SanitizedHTML(clean_html(value))
+
+
+class LazyHTML(SafeString):
+    """
+    Safe HTML loaded from an ``HTMLField`` whose dynamic attributes (e.g., ``data-cms-href``) are not
+    resolved yet. The string itself is the HTML as stored. Model instances resolve it when the field is
+    first accessed (see :class:`HTMLFieldDescriptor`), so that loading the value costs neither parsing
+    nor queries. Other values (e.g., from ``values_list()``) resolve it when rendered or converted with
+    ``str()``; string operations (comparison, ``len()``, slicing, JSON serialization) see the HTML as
+    stored. ``HTMLFieldQuerySet.resolve_html_references()`` resolves such rows when they are loaded.
+    """
+
+    _resolved = None
+
+    @property
+    def raw(self) -> str:
+        return str.__str__(self)
+
+    def resolve(self, objects: dict | None = None) -> SafeString:
+        """Resolves the dynamic attributes, using the already retrieved ``objects`` if given."""
+        if self._resolved is None:
+            self._resolved = mark_safe(
+                render_dynamic_attributes(self.raw, admin_objects=False, remove_attr=False, objects=objects)
+            )
+        return self._resolved
+
+    @property
+    def is_resolved(self) -> bool:
+        return self._resolved is not None
+
+    def __str__(self):
+        return self.resolve()
+
+    def __html__(self):
+        return self.resolve()
+
+
+class HTMLFieldDescriptor(DeferredAttribute):
+    """Resolves the dynamic attributes of a loaded ``HTMLField`` value when it is first accessed."""
+
+    def __get__(self, instance, cls=None):
+        value = super().__get__(instance, cls)
+        if isinstance(value, LazyHTML):
+            value = instance.__dict__[self.field.attname] = value.resolve()
+        return value
+
+    def __set__(self, instance, value):
+        instance.__dict__[self.field.attname] = value
+
+
+def resolve_html_references(objects, *field_names: str):
+    """
+    Resolves the dynamic attributes of the ``HTMLField`` values of all given model instances with one
+    query per referenced model (instead of one per value and model). Without field names all
+    ``HTMLField`` fields are resolved. Returns the objects.
+    """
+    values = []
+    for obj in objects:
+        names = field_names or [field.attname for field in obj._meta.concrete_fields if isinstance(field, HTMLField)]
+        for name in names:
+            # Not getattr(): the field's descriptor would resolve each value on its own
+            value = obj.__dict__.get(name)
+            if isinstance(value, LazyHTML):
+                values.append((obj, name, value))
+
+    from_db = _get_referenced_objects(value for _, _, value in values)
+    for obj, name, value in values:
+        obj.__dict__[name] = value.resolve(objects=from_db)
+    return objects
+
+
+def _resolve_html_rows(rows):
+    """Resolves the ``LazyHTML`` values of ``values()`` and ``values_list()`` rows in bulk."""
+
+    def row_values(row):
+        if isinstance(row, dict):
+            return row.values()
+        return row if isinstance(row, tuple) else (row,)
+
+    from_db = _get_referenced_objects(value for row in rows for value in row_values(row) if isinstance(value, LazyHTML))
+
+    def resolve(value):
+        return value.resolve(objects=from_db) if isinstance(value, LazyHTML) else value
+
+    resolved = []
+    for row in rows:
+        if isinstance(row, dict):
+            row = {key: resolve(value) for key, value in row.items()}
+        elif hasattr(row, "_make"):  # named=True
+            row = row._make(resolve(value) for value in row)
+        elif isinstance(row, tuple):
+            row = tuple(resolve(value) for value in row)
+        else:  # flat=True
+            row = resolve(row)
+        resolved.append(row)
+    return resolved
+
+
+def _get_referenced_objects(values):
+    references = {}
+    for value in values:
+        for model, ids in get_dynamic_references(value.raw).items():
+            references.setdefault(model, set()).update(ids)
+    return get_data_from_db(references)
+
+
+class HTMLFieldQuerySet(models.QuerySet):
+    """
+    QuerySet which can resolve the references of ``HTMLField`` values in bulk, like ``prefetch_related``
+    does for relations::
+
+        class Article(models.Model):
+            body = HTMLField()
+
+            objects = HTMLFieldQuerySet.as_manager()
+
+        Article.objects.resolve_html_references("body")
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._html_reference_fields = None
+
+    def resolve_html_references(self, *field_names: str) -> HTMLFieldQuerySet:
+        """
+        Returns a new QuerySet which resolves the references of the given ``HTMLField`` fields (or of all
+        of them if none is given) of all rows with one query per referenced model once it is evaluated.
+        Rows of ``values()`` and ``values_list()`` are resolved completely.
+        """
+        clone = self._chain()
+        clone._html_reference_fields = field_names
+        return clone
+
+    def _clone(self):
+        clone = super()._clone()
+        clone._html_reference_fields = self._html_reference_fields
+        return clone
+
+    def _fetch_all(self):
+        resolve = self._result_cache is None and self._html_reference_fields is not None
+        super()._fetch_all()
+        if resolve and issubclass(self._iterable_class, models.query.ModelIterable):
+            resolve_html_references(self._result_cache, *self._html_reference_fields)
+        elif resolve:
+            # Rows of values() and values_list() are not resolved when accessed: resolve them now
+            self._result_cache = _resolve_html_rows(self._result_cache)
 
 
 class HTMLFormField(CharField):
@@ -36,6 +194,8 @@ class HTMLFormField(CharField):
 
 
 class HTMLField(models.TextField):
+    descriptor_class = HTMLFieldDescriptor
+
     def __init__(self, *args, **kwargs):
         # This allows widget configuration customization
         # from the model definition
@@ -46,10 +206,22 @@ class HTMLField(models.TextField):
     def from_db_value(self, value, expression, connection, context=None):
         if value is None:
             return value
-        value = render_dynamic_attributes(value, admin_objects=False, remove_attr=False)
+        if get_dynamic_references(value):
+            # Resolving the references needs queries: postpone until the value is used
+            return LazyHTML(value)
         return mark_safe(value)
 
+    def pre_save(self, model_instance, add):
+        value = model_instance.__dict__.get(self.attname)
+        if isinstance(value, LazyHTML):
+            # Not accessed since it was loaded: save it without resolving the dynamic attributes
+            return value
+        return super().pre_save(model_instance, add)
+
     def get_prep_value(self, value):
+        if isinstance(value, LazyHTML):
+            # The dynamic attributes are resolved again when loaded
+            value = value.raw
         value = super().get_prep_value(value)
         if value is None:
             return value
@@ -78,6 +250,10 @@ class HTMLField(models.TextField):
     def clean(self, value, model_instance):
         # This needs to be marked safe as well because the form field's
         # clean method is not called on model.full_clean()
-        value = render_dynamic_attributes(value, admin_objects=False, remove_attr=False)
+        if isinstance(value, LazyHTML):
+            value = value.raw
+        if not is_sanitized(value):
+            # Values coming from HTMLFormField.clean already have their dynamic attributes rendered
+            value = render_dynamic_attributes(value, admin_objects=False, remove_attr=False)
         value = super().clean(value, model_instance)
         return sanitize_and_mark_safe(value)
@@ -1,3 +1,6 @@
+import time
+from functools import lru_cache
+
 from cms.models import CMSPlugin
 from django import forms
 from django.core import signing
@@ -5,22 +8,48 @@ from django.core.signing import BadSignature
 from django.forms.models import ModelForm
 from django.template import RequestContext
 
+from . import settings
 from .models import Text
 from .utils import _render_cms_plugin, plugin_to_tag
 
 
+@lru_cache(maxsize=1024)
+def _verify_action_token(token, salt):
+    # Raises BadSignature: exceptions are not cached, so invalid tokens cannot evict valid ones
+    signer = signing.TimestampSigner(salt=salt)
+    value = signer.unsign(token)
+    return value, signing.b62_decode(token.rsplit(signer.sep, 2)[-2])
+
+
+def _unsign_action_token(token, salt):
+    """
+    Verifies the signature of an action token and returns its value and timestamp (or None).
+    Editors send the same token with every preview request, so verified tokens are kept in memory.
+    """
+    try:
+        return _verify_action_token(token, salt)
+    except BadSignature:
+        return None
+
+
 class ActionTokenValidationForm(forms.Form):
     token = forms.CharField(required=True)
 
-    def get_id_from_token(self, session_id):
-        payload = self.cleaned_data["token"]
-
-        signer = signing.Signer(salt=session_id)
+    def get_token_data(self, session_id):
+        """Returns the ``(plugin_id, placeholder_id)`` pair of a valid, unexpired token or None."""
+        result = _unsign_action_token(self.cleaned_data["token"], session_id)
+        if result is None:
+            return None
+        value, timestamp = result
+        max_age = settings.TEXT_ACTION_TOKEN_MAX_AGE
+        if max_age is not None and time.time() - timestamp > max_age:
+            return None
+        plugin_id, _, placeholder_id = value.partition(":")
+        return plugin_id, placeholder_id or None
 
-        try:
-            return signer.unsign(payload)
-        except BadSignature:
-            return False
+    def get_id_from_token(self, session_id):
+        token_data = self.get_token_data(session_id)
+        return token_data[0] if token_data else False
 
 
 class RenderPluginForm(forms.Form):
@@ -35,7 +64,10 @@ class RenderPluginForm(forms.Form):
         self.fields["plugin"].queryset = self.get_child_plugins()
 
     def get_child_plugins(self):
-        return self.text_plugin.get_descendants()
+        # Inline plugins are direct children of the text plugin: use the indexed parent column
+        # instead of a tree query for the descendants. The placeholder is the one whose
+        # permissions have been checked.
+        return CMSPlugin.objects.filter(parent_id=self.text_plugin.pk, placeholder_id=self.text_plugin.placeholder_id)
 
     def render_plugin(self, request):
         plugin = self.cleaned_data["plugin"]
@@ -7,14 +7,22 @@ import re
 import uuid
 import warnings
 from copy import deepcopy
+from html import unescape
+from typing import TYPE_CHECKING
 
-import nh3
 from django.apps import apps
 from django.db import models
-from lxml import etree
-from lxml.etree import Element
+from django.utils.html import strip_tags
+from django.utils.safestring import SafeString
 
 from djangocms_text import settings
+from djangocms_text.links import get_link_provider
+
+if TYPE_CHECKING:
+    from lxml.etree import Element
+
+# lxml, nh3, html5lib and PIL are imported on first use: processes which never
+# clean or render text (e.g., most management commands) do not need to load them.
 
 dyn_attr_pattern = re.compile(r"<[^>]*data-cms-[^>]*>")
 image_data_pattern = re.compile(r'data:(?P<mime_type>[^"]*);(?P<encoding>[^"]*),(?P<data>[^"]*)')
@@ -52,10 +60,28 @@ class NH3Parser:
         if generic_attribute_prefixes is None:
             generic_attribute_prefixes = cms_generic_attribute_prefixes
 
+        self.additional_attributes: dict[str, set[str]] = additional_attributes
+        self.generic_attribute_prefixes: set[str] = generic_attribute_prefixes
+        #: Changes whenever the allowed tags or attributes are extended
+        self.version: int = 0
+
+    def __getattr__(self, name: str):
+        # The allowed tags, attributes and URL schemes are nh3's defaults extended by the additional
+        # attributes: they are computed on first access, so that nh3 is only imported then.
+        if name in ("ALLOWED_TAGS", "ALLOWED_ATTRIBUTES", "ALLOWED_URL_SCHEMES") and "additional_attributes" in vars(
+            self
+        ):
+            self._set_allowed()
+            return vars(self)[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
+    def _set_allowed(self) -> None:
+        import nh3
+
+        additional_attributes = self.additional_attributes
         self.ALLOWED_TAGS: set[str] = deepcopy(nh3.ALLOWED_TAGS)
         self.ALLOWED_ATTRIBUTES: dict[str, set[str]] = deepcopy(nh3.ALLOWED_ATTRIBUTES)
         self.ALLOWED_URL_SCHEMES: set[str] = deepcopy(nh3.ALLOWED_URL_SCHEMES) | set(settings.TEXT_ADDITIONAL_PROTOCOLS)
-        self.generic_attribute_prefixes: set[str] = generic_attribute_prefixes
 
         for tag, attributes in settings.TEXT_ADDITIONAL_ATTRIBUTES.items():
             if tag in additional_attributes:
@@ -107,9 +133,13 @@ def register_cleaner_attributes(tag_attrs: dict) -> None:
 
     Entries merge with any existing attribute set for the tag.
     """
+    cms_parser.version += 1
     for tag, attrs in tag_attrs.items():
         attrs = set(attrs)
         cms_additional_attributes[tag] = cms_additional_attributes.get(tag, set()) | attrs
+        if "ALLOWED_TAGS" not in vars(cms_parser):
+            # Not computed yet: cms_parser picks the attributes up from cms_additional_attributes
+            continue
         if tag != "*":
             cms_parser.ALLOWED_TAGS.add(tag)
         cms_parser.ALLOWED_ATTRIBUTES[tag] = cms_parser.ALLOWED_ATTRIBUTES.get(tag, set()) | attrs
@@ -124,6 +154,8 @@ def clean_html(data: str, full: bool | None = None, cleaner: NH3Parser = None) -
 
     if settings.TEXT_HTML_SANITIZE is False:
         return data
+    if cleaner in (None, cms_parser) and is_sanitized(data):
+        return data
 
     if full is not None:
         warnings.warn(
@@ -131,10 +163,136 @@ def clean_html(data: str, full: bool | None = None, cleaner: NH3Parser = None) -
             category=DeprecationWarning,
             stacklevel=2,
         )
+    import nh3
+
     cleaner = cleaner or cms_parser
     return nh3.clean(data, **cleaner())
 
 
+class SanitizedHTML(SafeString):
+    """
+    Safe HTML which has been sanitized by ``clean_html`` with the default cleaner. Later stages (e.g.,
+    ``HTMLField.clean`` and ``HTMLField.get_prep_value`` after ``HTMLFormField.clean``) skip sanitizing
+    it again unless the cleaner's configuration has changed since (see ``version``).
+    """
+
+    def __new__(cls, value: str, version: int | None = None):
+        obj = super().__new__(cls, value)
+        obj.version = cms_parser.version if version is None else version
+        return obj
+
+
+def is_sanitized(value) -> bool:
+    """Returns True if the value has been sanitized with the current configuration of the default cleaner."""
+    return isinstance(value, SanitizedHTML) and value.version == cms_parser.version
+
+
+_VOID_ELEMENTS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+_TAG_RE = re.compile(r"""<(/?)([a-zA-Z][\w:-]*)(?:[^>"']|"[^"]*"|'[^']*')*?(/?)>""")
+
+
+def split_html_blocks(html: str) -> list[str]:
+    """
+    Splits sanitized HTML into its top-level nodes (elements and text runs), so that
+    ``"".join(split_html_blocks(html)) == html``.
+
+    The HTML must be well-formed as serialized by the sanitizer (all non-void elements closed, no
+    comments). Raises ValueError otherwise.
+    """
+    blocks, depth, start = [], 0, 0
+    for match in _TAG_RE.finditer(html):
+        closing, name, self_closing = match.groups()
+        if depth == 0 and match.start() > start:
+            blocks.append(html[start : match.start()])
+            start = match.start()
+        if closing:
+            depth -= 1
+            if depth < 0:
+                raise ValueError(f"Unexpected closing tag </{name}>")
+        elif not self_closing and name.lower() not in _VOID_ELEMENTS:
+            depth += 1
+        if depth == 0:
+            blocks.append(html[start : match.end()])
+            start = match.end()
+    if depth:
+        raise ValueError("Unclosed element")
+    if start < len(html):
+        blocks.append(html[start:])
+    return blocks
+
+
+# Plugins inside these elements are inline nodes of the editor
+_TEXTBLOCK_ELEMENTS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "pre"}
+_INLINE_ELEMENTS = {"a", "abbr", "b", "code", "em", "i", "mark", "s", "small", "span", "strong", "sub", "sup", "u"}
+_PLUGIN_ID_RE = re.compile(r"""\bid=["'](\d+)["']""")
+
+
+def get_plugin_node_types(html: str) -> dict[int, str]:
+    """
+    Returns the editor node type of each ``<cms-plugin>`` tag in ``html`` by its plugin id:
+    ``"cmsPlugin"`` for plugins in inline content (e.g., inside a paragraph or next to top-level
+    text), ``"cmsBlockPlugin"`` otherwise. Used when plugins are sent to the editor without their
+    rendered content.
+    """
+    node_types, open_elements = {}, []
+    inline_run, block_plugin, position = False, None, 0
+
+    def inline_content():
+        # Top-level text or inline elements: the editor wraps them and neighboring plugins in a paragraph
+        nonlocal inline_run, block_plugin
+        inline_run = True
+        if block_plugin is not None:
+            node_types[block_plugin] = "cmsPlugin"
+            block_plugin = None
+
+    for match in _TAG_RE.finditer(html):
+        closing, name, self_closing = match.groups()
+        name = name.lower()
+        if not open_elements and html[position : match.start()].strip():
+            inline_content()
+        position = match.end()
+        if closing:
+            if name in open_elements:
+                # Be lenient with unclosed elements
+                del open_elements[len(open_elements) - open_elements[::-1].index(name) - 1 :]
+            continue
+        if name == "cms-plugin" and (plugin_id := _PLUGIN_ID_RE.search(match.group(0))):
+            plugin_id = int(plugin_id.group(1))
+            if open_elements:
+                inline = any(element in _TEXTBLOCK_ELEMENTS or element in _INLINE_ELEMENTS for element in open_elements)
+            else:
+                inline = inline_run
+                block_plugin = None if inline else plugin_id
+            node_types[plugin_id] = "cmsPlugin" if inline else "cmsBlockPlugin"
+        elif not open_elements:
+            if name in _INLINE_ELEMENTS:
+                inline_content()
+            else:
+                inline_run, block_plugin = False, None
+        if not self_closing and name not in _VOID_ELEMENTS:
+            open_elements.append(name)
+    if not open_elements and html[position:].strip():
+        inline_content()
+    return node_types
+
+
+_PLUGIN_CONTENT_RE = re.compile(r"(<cms-plugin\b[^>]*>).*?</cms-plugin>", re.DOTALL)
+
+
+def get_block_hash(block: str) -> int:
+    """
+    Returns a 32-bit FNV-1a hash of the text of an HTML block, used to check that an inline patch
+    replaces the blocks the editor saw. ``cms.editor.js`` hashes the editor's HTML the same way:
+    markup, child plugin previews, soft hyphens and whitespace are ignored, so that the sanitized
+    and hyphenated block stored on the server has the same hash.
+    """
+    text = unescape(strip_tags(_PLUGIN_CONTENT_RE.sub(r"\1", block))).replace("\xad", "")
+    value = 0x811C9DC5
+    for char in "".join(text.split()):
+        value = ((value ^ ord(char)) * 0x01000193) & 0xFFFFFFFF
+    return value
+
+
 dynamic_attr_pool = {}
 #: A dictionary mapping attribute names to functions that update dynamic attribute values.
 
@@ -161,7 +319,8 @@ def get_xpath(pool: dict) -> str:
 
 def get_data_from_db(models: dict, admin_objects: bool = False) -> dict:
     """
-    Retrieve data from the database.
+    Retrieve data from the database. Models with a registered link provider are resolved by the
+    provider's batch resolver.
 
     Parameters:
     - models (dict): A dictionary mapping model names to lists of object IDs.
@@ -174,7 +333,11 @@ def get_data_from_db(models: dict, admin_objects: bool = False) -> dict:
     """
     result = {}
     for model, ids in models.items():
+        provider = get_link_provider(model)
         try:
+            if provider is not None:
+                result[model] = provider.resolve(ids, admin_objects=admin_objects)
+                continue
             DjangoModel = apps.get_model(*model.split(".")[:2])
             if admin_objects and hasattr(DjangoModel, "admin_manager"):
                 manager = DjangoModel.admin_manager
@@ -186,6 +349,16 @@ def get_data_from_db(models: dict, admin_objects: bool = False) -> dict:
     return result
 
 
+def _get_object_url(obj: models.Model | None) -> str | None:
+    # Returns None if the object has no URL at all (neither a link provider nor get_absolute_url)
+    provider = get_link_provider(obj._meta.label_lower) if isinstance(obj, models.Model) else None
+    if provider is not None:
+        return provider.get_url(obj)
+    if hasattr(obj, "get_absolute_url"):
+        return obj.get_absolute_url() or ""
+    return None
+
+
 def dynamic_href(elem: Element, obj: models.Model, attr: str, edit_mode: bool = False) -> None:
     """
     Modifies an element's attribute to create a dynamic hyperlink based on the provided model object.
@@ -205,9 +378,8 @@ def dynamic_href(elem: Element, obj: models.Model, attr: str, edit_mode: bool =
     :return: None
     """
 
-    target_value = ""
-    if hasattr(obj, "get_absolute_url"):
-        target_value = obj.get_absolute_url()
+    target_value = _get_object_url(obj)
+    if target_value is not None:
         elem.attrib[attr] = target_value or "#"
     if not target_value:
         elem.attrib["data-cms-error"] = "ref-not-found"
@@ -232,16 +404,36 @@ def dynamic_src(elem: Element, obj: models.Model, attr: str, edit_mode: bool = F
     :return: None
     :rtype: NoneType
     """
-    target_value = ""
-    if hasattr(obj, "get_absolute_url"):
-        target_value = obj.get_absolute_url()
-        if target_value:
-            elem.attrib[attr] = target_value
+    target_value = _get_object_url(obj)
+    if target_value:
+        elem.attrib[attr] = target_value
     if not target_value:
         elem.attrib["data-cms-error"] = "ref-not-found"
 
 
-def render_dynamic_attributes(dyn_html: str, admin_objects: bool = False, remove_attr=True) -> str:
+def get_dynamic_references(dyn_html: str) -> dict[str, set[int]]:
+    """
+    Returns the objects referenced by the dynamic attributes of the HTML without parsing it.
+
+    Returns:
+    - dict: A dictionary mapping model names to sets of object IDs, as expected by ``get_data_from_db``
+    """
+    references = {}
+    if not dyn_attr_pattern.search(dyn_html):
+        return references
+    attrs = "|".join(re.escape(attr) for attr in dynamic_attr_pool)
+    for value in re.findall(rf"""\b(?:{attrs})\s*=\s*["']([^"']*)["']""", dyn_html):
+        try:
+            model, pk = value.rsplit(":", 1)
+            references.setdefault(model.strip(), set()).add(int(pk.strip()))
+        except ValueError:
+            pass
+    return references
+
+
+def render_dynamic_attributes(
+    dyn_html: str, admin_objects: bool = False, remove_attr=True, objects: dict | None = None
+) -> str:
     """
     Render method to update dynamic attributes in HTML
 
@@ -250,6 +442,8 @@ def render_dynamic_attributes(dyn_html: str, admin_objects: bool = False, remove
     - admin_objects (bool) (optional): Flag to indicate whether to fetch data from admin objects (default: False)
     - remove_attr (bool) (optional): Flag to indicate whether to remove dynamic attributes from the final HTML
       (default: True)
+    - objects (dict) (optional): Objects already retrieved by ``get_data_from_db``, e.g., for many HTML values
+      at once. If given, no queries are made.
 
     Returns:
     - str: The updated HTML content with dynamic attributes
@@ -259,6 +453,8 @@ def render_dynamic_attributes(dyn_html: str, admin_objects: bool = False, remove
         # No dynamic attributes found, skip processing the html tree
         return dyn_html
 
+    from lxml import etree
+
     req_model_obj = {}
     tree = etree.fromstring(dyn_html, parser=etree.HTMLParser())
     if tree is None:
@@ -279,7 +475,7 @@ def render_dynamic_attributes(dyn_html: str, admin_objects: bool = False, remove
                 except (TypeError, ValueError):
                     pass
                 update_queue.append(elem)
-    from_db = get_data_from_db(req_model_obj, admin_objects=admin_objects)
+    from_db = objects if objects is not None else get_data_from_db(req_model_obj, admin_objects=admin_objects)
     for elem in update_queue:
         for attr, value in elem.attrib.items():
             if attr in dynamic_attr_pool:
@@ -307,15 +503,6 @@ register_attr("data-cms-href", dynamic_href)
 register_attr("data-cms-src", dynamic_src)
 
 
-try:
-    import html5lib
-    from PIL import Image
-except ModuleNotFoundError:
-
-    class PIL:
-        pass
-
-
 def extract_images(data, plugin):
     """
     extracts base64 encoded images from drag and drop actions in browser and saves
@@ -325,6 +512,8 @@ def extract_images(data, plugin):
 
     if not settings.TEXT_SAVE_IMAGE_FUNCTION:
         return data
+    import html5lib
+
     tree_builder = html5lib.treebuilders.getTreeBuilder("dom")
     parser = html5lib.html5parser.HTMLParser(tree=tree_builder)
     dom = parser.parse(data)
@@ -363,6 +552,8 @@ def extract_images(data, plugin):
             file_ending = "gif"
         else:
             # any not "web-safe" image format we try to convert to jpg
+            from PIL import Image
+
             im = Image.open(image)
             new_image = io.BytesIO()
             file_ending = "jpg"
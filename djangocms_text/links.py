@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from time import monotonic
+
+from django.apps import apps
+from django.contrib.auth import get_permission_codename
+from django.db import models
+from django.db.models import Case, Q, QuerySet, Value, When
+from django.utils.encoding import force_str
+
+
+class LinkProvider:
+    """
+    Makes objects of a model available in the link dialog of the editor and resolves
+    ``data-cms-href`` references to them when the text is rendered.
+
+    :param model: The model label, e.g. ``"shop.product"``.
+    :type model: str
+    :param search_fields: Fields searched (case-insensitively) for the search term. The first field
+        is used to rank matches which start with the search term first.
+    :type search_fields: tuple[str, ...]
+    :param url_builder: Optional callable returning the URL of an object. Defaults to
+        ``obj.get_absolute_url()``.
+    :type url_builder: Callable[..., str] | None
+    """
+
+    def __init__(self, model: str, search_fields: tuple[str, ...] = (), url_builder: Callable[..., str] | None = None):
+        if not search_fields:
+            raise ValueError("At least one search field is required")
+        self.model_label = model.lower()
+        self.search_fields = tuple(search_fields)
+        self.url_builder = url_builder
+
+    @property
+    def model(self) -> type[models.Model]:
+        return apps.get_model(self.model_label)
+
+    def get_queryset(self, admin_objects: bool = False) -> QuerySet:
+        """
+        Returns the queryset of linkable objects. Uses the ``admin_manager`` (if available) for admin objects.
+        """
+        model = self.model
+        if admin_objects and hasattr(model, "admin_manager"):
+            return model.admin_manager.all()
+        return model._default_manager.all()
+
+    def get_url(self, obj: models.Model) -> str:
+        if self.url_builder is not None:
+            return self.url_builder(obj)
+        return obj.get_absolute_url() if hasattr(obj, "get_absolute_url") else ""
+
+    def get_text(self, obj: models.Model) -> str:
+        return force_str(obj)
+
+    def get_reference(self, obj: models.Model) -> str:
+        return f"{self.model_label}:{obj.pk}"
+
+    def search(self, search: str, offset: int = 0, limit: int = 50, admin_objects: bool = True) -> list[models.Model]:
+        """
+        Returns up to ``limit`` objects matching the search term, those starting with it first.
+        """
+        first_field = self.search_fields[0]
+        query = Q()
+        for field in self.search_fields:
+            query |= Q(**{f"{field}__icontains": search})
+        return list(
+            self.get_queryset(admin_objects=admin_objects)
+            .filter(query)
+            .annotate(
+                prefix_match=Case(When(**{f"{first_field}__istartswith": search}, then=Value(0)), default=Value(1))
+            )
+            .order_by("prefix_match", first_field, "pk")[offset : offset + limit]
+        )
+
+    def resolve(self, ids, admin_objects: bool = False) -> dict:
+        """
+        Batch resolver: returns a dictionary mapping the given primary keys to their objects.
+        """
+        return self.get_queryset(admin_objects=admin_objects).in_bulk(ids)
+
+
+link_providers: dict[str, LinkProvider] = {}
+
+
+def register(provider: LinkProvider) -> None:
+    """
+    Registers a link provider. A provider registered later for the same model replaces the earlier one.
+
+    :param provider: An instance of LinkProvider.
+    :type provider: LinkProvider
+    """
+    if not isinstance(provider, LinkProvider):
+        raise TypeError("provider must be an instance of LinkProvider")
+    link_providers[provider.model_label] = provider
+
+
+def get_link_provider(model_label: str) -> LinkProvider | None:
+    return link_providers.get(model_label.lower())
+
+
+def can_view_model(user, model: type[models.Model]) -> bool:
+    """
+    Returns True if the user may view objects of the model. As in the Django admin, the change
+    permission implies the view permission.
+    """
+    opts = model._meta
+    return any(
+        user.has_perm(f"{opts.app_label}.{get_permission_codename(action, opts)}") for action in ("view", "change")
+    )
+
+
+def search_link_providers(
+    search: str, offset: int, limit: int, budget: float | None = None, user=None
+) -> tuple[list, bool]:
+    """
+    Searches all registered link providers and returns the results as select2 groups, one per model,
+    together with a flag telling if any provider has more results.
+
+    If a ``user`` is given, providers of models the user may not view are skipped.
+
+    Providers are queried one after the other: once the time ``budget`` (in seconds) is used up, the
+    remaining providers are skipped.
+
+    :param search: The search term.
+    :param offset: Number of results to skip for each provider.
+    :param limit: Maximum number of results for each provider.
+    :param budget: Time budget in seconds or None for no limit.
+    :param user: The user the results are shown to or None to skip the permission check.
+    """
+    groups, more = [], False
+    start = monotonic()
+    for provider in link_providers.values():
+        if budget is not None and monotonic() - start > budget:
+            break
+        if user is not None and not can_view_model(user, provider.model):
+            continue
+        objects = provider.search(search, offset=offset, limit=limit + 1)
+        if len(objects) > limit:
+            more = True
+            objects = objects[:limit]
+        if objects:
+            groups.append(
+                {
+                    "text": force_str(provider.model._meta.verbose_name_plural).capitalize(),
+                    "children": [
+                        {
+                            "text": provider.get_text(obj),
+                            "url": provider.get_url(obj),
+                            "id": provider.get_reference(obj),
+                            "verbose": provider.get_text(obj),
+                        }
+                        for obj in objects
+                    ],
+                }
+            )
+    return groups, more
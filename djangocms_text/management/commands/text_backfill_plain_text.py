@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from djangocms_text.models import Text
+
+
+class Command(BaseCommand):
+    help = (
+        "Computes the plain text, excerpt and content hash of text plugins saved before these fields existed. "
+        "Use --all to recompute them for all text plugins."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--all", action="store_true", help="Recompute the fields for all text plugins")
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rows per update (default: 1000)")
+
+    def handle(self, *args, **options):
+        queryset = Text.objects.only("pk", "body", "content_hash").order_by("pk")
+        if not options["all"]:
+            queryset = queryset.filter(content_hash="")
+        batch_size = options["batch_size"]
+        last_pk, updated = 0, 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last_pk)[:batch_size])
+            if not batch:
+                break
+            for text in batch:
+                text.update_plain_text()
+            Text.objects.bulk_update(batch, Text._plain_text_fields)
+            last_pk = batch[-1].pk
+            updated += len(batch)
+        self.stdout.write(f"Updated {updated} text plugin(s).")
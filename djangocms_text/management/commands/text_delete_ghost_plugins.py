@@ -0,0 +1,25 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from djangocms_text import settings
+from djangocms_text.models import delete_ghost_plugins
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes text plugins which were added but never saved or cancelled (e.g., because the browser tab "
+        "was closed) and are older than the given age."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            default=settings.TEXT_GHOST_PLUGIN_MAX_AGE,
+            help="Minimum age in seconds (default: TEXT_GHOST_PLUGIN_MAX_AGE)",
+        )
+
+    def handle(self, *args, **options):
+        deleted = delete_ghost_plugins(max_age=timedelta(seconds=options["max_age"]))
+        self.stdout.write(f"Deleted {deleted} ghost text plugin(s).")
@@ -0,0 +1,26 @@
+from pprint import pformat
+
+from django.core.management.base import BaseCommand
+
+from djangocms_text.apps import discover_inline_editable_models
+
+
+class Command(BaseCommand):
+    help = (
+        "Discovers the frontend-editable fields and writes them as a Python module. "
+        "Point the TEXT_INLINE_MODELS_MODULE setting to the module to skip the discovery at runtime."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", "-o", help="File to write the module to (default: stdout)")
+
+    def handle(self, *args, **options):
+        source = (
+            "# Generated by the text_inline_models management command. Do not edit.\n"
+            f"INLINE_MODELS = {pformat(discover_inline_editable_models(), width=100)}\n"
+        )
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                file.write(source)
+        else:
+            self.stdout.write(source, ending="")
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_text", "0004_remove_old_ckeditor_table"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="text",
+            name="excerpt",
+            field=models.CharField(blank=True, default="", editable=False, max_length=255, verbose_name="excerpt"),
+        ),
+        migrations.AddField(
+            model_name="text",
+            name="plain_text",
+            field=models.TextField(blank=True, default="", editable=False, verbose_name="plain text"),
+        ),
+    ]
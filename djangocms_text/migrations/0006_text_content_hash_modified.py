@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_text", "0005_text_plain_text_excerpt"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="text",
+            name="content_hash",
+            field=models.CharField(blank=True, default="", editable=False, max_length=64, verbose_name="content hash"),
+        ),
+        migrations.AddField(
+            model_name="text",
+            name="modified",
+            field=models.DateTimeField(blank=True, db_index=True, editable=False, null=True, verbose_name="modified"),
+        ),
+    ]
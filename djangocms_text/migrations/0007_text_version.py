@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("djangocms_text", "0006_text_content_hash_modified"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="text",
+            name="version",
+            field=models.PositiveIntegerField(default=1, editable=False, verbose_name="version"),
+        ),
+    ]
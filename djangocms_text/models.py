@@ -1,21 +1,56 @@
+from collections import defaultdict
 from copy import deepcopy
+from datetime import timedelta
+from hashlib import sha256
+from html import unescape
 
 from django.apps import apps
-from django.db import models
+from django.db import DatabaseError, connection, connections, models, router, transaction
+from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.html import strip_tags
 from django.utils.text import Truncator
 from django.utils.translation import gettext_lazy as _
 
 _MAX_RTE_LENGTH = 16
+_MAX_EXCERPT_LENGTH = 255
+_EXCERPT_WORDS = 3
+
+
+class TextVersionConflict(DatabaseError):
+    """Raised when saving a text which has been saved by someone else since it was loaded."""
+
+
+def get_plain_text(body: str) -> str:
+    """
+    Returns the plain text of an HTML body: tags are stripped, entities unescaped and soft
+    hyphens removed.
+    """
+    return " ".join(unescape(strip_tags(force_str(body))).replace("\xad", "").split())
+
+
+def get_excerpt(plain_text: str) -> str:
+    """Returns the short label of a text plugin shown in structure mode and the admin."""
+    return Truncator(Truncator(plain_text).words(_EXCERPT_WORDS, truncate="...")).chars(_MAX_EXCERPT_LENGTH)
+
+
+def get_content_hash(plain_text: str) -> str:
+    """Returns the hash identifying the plain text of a text plugin."""
+    return sha256(plain_text.encode()).hexdigest()
 
 
 if apps.is_installed("cms"):
     from cms.models import CMSPlugin
 
     from . import settings
-    from .html import clean_html, extract_images
-    from .utils import plugin_tags_to_db, plugin_tags_to_id_list, plugin_to_tag, replace_plugin_tags
+    from .html import clean_html, extract_images, get_block_hash, split_html_blocks
+    from .utils import (
+        is_cms_v4,
+        plugin_tags_to_db,
+        plugin_tags_to_id_list,
+        plugin_to_tag,
+        replace_plugin_tags,
+    )
 
     try:
         from softhyphen.html import hyphenate
@@ -24,6 +59,181 @@ if apps.is_installed("cms"):
         def hyphenate(t):
             return t
 
+    def _bulk_add_child_plugins(children_count):
+        """
+        Make room for ``children_count[text_plugin]`` new first children directly behind each text
+        plugin (CMS v4+ plugin positions) and update the text plugins' positions in memory.
+
+        Per placeholder and language, all plugins behind the first text plugin are parked above the
+        last position and then moved back to their final positions with one update, each segment
+        (the plugins behind one text plugin) by its own offset. Neither step can collide with the
+        unique position constraint.
+        """
+        groups = defaultdict(list)
+        # In-memory positions may be outdated: other plugins may have been added since
+        positions = dict(
+            CMSPlugin.objects.filter(pk__in=[plugin.pk for plugin in children_count]).values_list("pk", "position")
+        )
+        for text_plugin in children_count:
+            text_plugin.position = positions[text_plugin.pk]
+            groups[(text_plugin.placeholder_id, text_plugin.language)].append(text_plugin)
+        last_positions = {
+            (row["placeholder_id"], row["language"]): row["last_position"]
+            for row in CMSPlugin.objects.filter(placeholder_id__in={key[0] for key in groups})
+            .values("placeholder_id", "language")
+            .annotate(last_position=models.Max("position"))
+        }
+        for (placeholder_id, language), text_plugins in groups.items():
+            text_plugins.sort(key=lambda plugin: plugin.position)
+            plugins = CMSPlugin.objects.filter(placeholder_id=placeholder_id, language=language)
+            park_offset = last_positions[(placeholder_id, language)] + sum(
+                children_count[text_plugin] for text_plugin in text_plugins
+            )
+            original_positions = [text_plugin.position for text_plugin in text_plugins]
+            plugins.filter(position__gt=original_positions[0]).update(position=models.F("position") + park_offset)
+
+            # Parked positions are above all final positions: the segments can be moved back in one update
+            shift, segments = 0, []
+            for index, text_plugin in enumerate(text_plugins):
+                text_plugin.position += shift
+                shift += children_count[text_plugin]
+                if index + 1 < len(text_plugins):
+                    segments.append(
+                        models.When(
+                            position__lte=original_positions[index + 1] + park_offset,
+                            then=models.F("position") - park_offset + shift,
+                        )
+                    )
+            plugins.filter(position__gt=original_positions[0] + park_offset).update(
+                position=models.Case(*segments, default=models.F("position") - park_offset + shift)
+            )
+
+    def _bulk_insert_plugins(plugins):
+        """
+        Insert new (downcasted) plugin instances with their positions set: one bulk insert for the
+        ``CMSPlugin`` table and one per additional table of the plugin models.
+        """
+        base_fields = [field.attname for field in CMSPlugin._meta.concrete_fields if not field.primary_key]
+        for plugin in plugins:
+            if isinstance(plugin, AbstractText):
+                plugin.update_plain_text()
+        base_plugins = CMSPlugin.objects.bulk_create(
+            [CMSPlugin(**{name: getattr(plugin, name) for name in base_fields}) for plugin in plugins]
+        )
+        plugins_by_model = defaultdict(list)
+        for plugin, base_plugin in zip(plugins, base_plugins):
+            for name in base_fields:
+                setattr(plugin, name, getattr(base_plugin, name))
+            plugin.pk = base_plugin.pk
+            if plugin._meta.concrete_model is not CMSPlugin:
+                plugins_by_model[plugin._meta.concrete_model].append(plugin)
+
+        using = base_plugins[0]._state.db
+        for model, model_plugins in plugins_by_model.items():
+            # Django's bulk_create does not support multi-table inheritance: insert each table below
+            # CMSPlugin separately
+            for table_model in (*reversed(model._meta.get_parent_list()), model):
+                if table_model is not CMSPlugin:
+                    _insert_rows(table_model, model_plugins, using)
+        for plugin in plugins:
+            plugin._state.adding = False
+            plugin._state.db = using
+
+    def _insert_rows(table_model, plugins, using):
+        """
+        Insert the rows of the plugins into the table of ``table_model`` (below ``CMSPlugin``) with
+        one INSERT statement. The plugins' primary keys have been set by the ``CMSPlugin`` insert.
+        """
+        connection = connections[using]
+        fields = table_model._meta.local_concrete_fields
+        rows = []
+        for plugin in plugins:
+            for parent_link in table_model._meta.parents.values():
+                setattr(plugin, parent_link.attname, plugin.pk)
+            rows.append([field.get_db_prep_save(field.pre_save(plugin, True), connection) for field in fields])
+        quote_name = connection.ops.quote_name
+        sql = "INSERT INTO {} ({}) VALUES ({})".format(
+            quote_name(table_model._meta.db_table),
+            ", ".join(quote_name(field.column) for field in fields),
+            ", ".join(["%s"] * len(fields)),
+        )
+        with connection.cursor() as cursor:
+            cursor.executemany(sql, rows)
+
+    def _add_descendants(plugin_ids, plugin_parents):
+        """
+        Returns the given plugin ids together with the ids of all their descendants among
+        ``plugin_parents``, an iterable of ``(pk, parent_id)`` pairs.
+        """
+        to_delete = set(plugin_ids)
+        children = defaultdict(list)
+        for pk, parent_id in plugin_parents:
+            children[parent_id].append(pk)
+        pending = list(to_delete)
+        while pending:
+            for child_id in children[pending.pop()]:
+                if child_id not in to_delete:
+                    to_delete.add(child_id)
+                    pending.append(child_id)
+        return to_delete
+
+    def _get_plugin_model_lookup(model):
+        """Returns the lookup from ``CMSPlugin`` to a (multi-table inherited) plugin model, e.g. ``djangocms_text_text``."""
+        lookups = []
+        while model is not CMSPlugin:
+            model, parent_link = next(
+                (parent, link) for parent, link in model._meta.parents.items() if issubclass(parent, CMSPlugin)
+            )
+            lookups.insert(0, parent_link.related_query_name())
+        return "__".join(lookups)
+
+    def delete_ghost_plugins(max_age=None):
+        """
+        Deletes "ghost" text plugins: ``CMSPlugin`` rows of text plugins without a text row. The add view
+        creates them so that child plugins can be added before the text is saved for the first time. They
+        are left behind if the editor is closed without saving or cancelling (e.g., by closing the browser
+        tab).
+
+        Only ghosts older than ``max_age`` (a timedelta, defaults to ``TEXT_GHOST_PLUGIN_MAX_AGE`` seconds)
+        are deleted since younger ones may still be edited. The ghosts and their descendants are deleted
+        in bulk, one placeholder at a time, and the plugin positions are re-compacted once per placeholder
+        and language.
+
+        Returns the number of deleted ghost plugins.
+        """
+        from cms.plugin_pool import plugin_pool
+
+        if max_age is None:
+            max_age = timedelta(seconds=settings.TEXT_GHOST_PLUGIN_MAX_AGE)
+        created_before = timezone.now() - max_age
+
+        ghosts_by_placeholder = defaultdict(list)
+        for plugin_class in plugin_pool.get_all_plugins():
+            if not issubclass(plugin_class.model, AbstractText):
+                continue
+            ghosts = CMSPlugin.objects.filter(
+                plugin_type=plugin_class.__name__,
+                creation_date__lt=created_before,
+                **{f"{_get_plugin_model_lookup(plugin_class.model)}__isnull": True},
+            ).select_related("placeholder")
+            for ghost in ghosts:
+                ghosts_by_placeholder[ghost.placeholder].append(ghost)
+
+        for placeholder, ghosts in ghosts_by_placeholder.items():
+            with transaction.atomic():
+                if hasattr(placeholder, "delete_plugins"):  # since CMS v5.1
+                    placeholder.delete_plugins(ghosts)
+                elif hasattr(placeholder, "delete_plugin"):  # since CMS v4
+                    plugin_parents = placeholder.cmsplugin_set.values_list("pk", "parent_id")
+                    to_delete = _add_descendants([ghost.pk for ghost in ghosts], plugin_parents)
+                    placeholder.cmsplugin_set.filter(pk__in=to_delete).delete()
+                    for language in {ghost.language for ghost in ghosts}:
+                        placeholder._recalculate_plugin_positions(language)
+                else:  # up to CMS v3.11
+                    for ghost in ghosts:
+                        ghost.delete()
+        return sum(len(ghosts) for ghosts in ghosts_by_placeholder.values())
+
     class AbstractText(CMSPlugin):
         """
         Abstract Text Plugin Class designed to be backwards compatible with
@@ -58,32 +268,101 @@ if apps.is_installed("cms"):
             max_length=_MAX_RTE_LENGTH,
             help_text="The rich text editor used to create this text. JSON formats vary between editors.",
         )
-
         search_fields = ("body",)
+        # Models with the plain text fields and the version field (see Text) maintain them on save.
+        # Subclasses in other apps need not have these columns.
+        _plain_text_fields = ()
+        _versioned = False
+        _processed_body = None
 
         class Meta:
             abstract = True
 
         def __str__(self):
-            return Truncator(strip_tags(self.body).replace("&shy;", "")).words(3, truncate="...")
+            # The content hash is set whenever the excerpt is computed, even if the excerpt is empty
+            if self._plain_text_fields and (self.content_hash or not self.body):
+                return self.excerpt
+            # Not saved (or not backfilled) yet
+            return get_excerpt(get_plain_text(self.body))
 
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.body = force_str(self.body)
 
         def clean(self):
-            self.body = plugin_tags_to_db(self.body)
+            if self.body is not self._processed_body:
+                self.body = plugin_tags_to_db(self.body)
 
-        def save(self, *args, **kwargs):
-            adding = self._state.adding
-            original_body = self.body
+        def update_plain_text(self):
+            """
+            Computes the ``plain_text``, ``excerpt`` and ``content_hash`` fields from the body. New
+            texts and texts whose plain text changed get a new ``modified`` timestamp. Does nothing for
+            models without these fields.
+            """
+            if not self._plain_text_fields:
+                return
+            self.plain_text = get_plain_text(self.body)
+            self.excerpt = get_excerpt(self.plain_text)
+            content_hash = get_content_hash(self.plain_text)
+            if content_hash != self.content_hash or self.pk is None:
+                self.content_hash = content_hash
+                self.modified = timezone.now()
 
-            # Embedded image plugins need a persisted parent. Existing text
-            # plugins can transform their body before their only write.
-            if adding:
-                super().save(*args, **kwargs)
+        def get_body_version(self):
+            """Returns the version of the stored body that inline patches must be based on."""
+            if not self._versioned:
+                return get_content_hash(self.body)
+            return str(self.version)
+
+        def apply_body_patch(self, patch):
+            """
+            Applies an inline editing patch to the body: ``patch["delete"]`` top-level blocks of the body
+            starting at ``patch["start"]`` are replaced by the HTML blocks in ``patch["insert"]``. Only the
+            inserted blocks are sanitized, the kept blocks have been sanitized when they were saved.
 
-            body = self.body
+            The patch must be based on the current body: ``patch["version"]`` and ``patch["length"]``
+            (number of blocks) must match, and ``patch["hashes"]`` must be the :func:`get_block_hash` of the
+            replaced blocks and their neighbours, i.e., of the editor's blocks that the patch is meant for.
+            If the editor stores its JSON, ``patch["json_insert"]`` replaces the nodes of the replaced
+            blocks in :attr:`json`. Raises ValueError otherwise.
+
+            Returns True if the patch inserted or removed child plugins.
+            """
+            if str(patch["version"]) != self.get_body_version():
+                raise ValueError("The text has been changed in the meantime")
+            blocks = split_html_blocks(self.body)
+            start, delete, insert = int(patch["start"]), int(patch["delete"]), patch["insert"]
+            if (
+                int(patch["length"]) != len(blocks)
+                or not 0 <= start <= start + delete <= len(blocks)
+                or not isinstance(insert, list)
+                or not all(isinstance(block, str) for block in insert)
+            ):
+                raise ValueError("The patch does not apply to the text")
+            if patch["hashes"] != [get_block_hash(block) for block in blocks[max(start - 1, 0) : start + delete + 1]]:
+                raise ValueError("The patch does not match the blocks of the text")
+            self._apply_json_patch(start, delete, patch.get("json_insert"), len(blocks), len(insert))
+            removed = "".join(blocks[start : start + delete])
+            inserted = self._process_body(plugin_tags_to_db("".join(insert)))
+            self.body = "".join(blocks[:start]) + inserted + "".join(blocks[start + delete :])
+            self._processed_body = self.body
+            return "<cms-plugin" in removed or "<cms-plugin" in inserted
+
+        def _apply_json_patch(self, start, delete, nodes, length, inserted):
+            # The editor's JSON document has one top-level node per block of the body
+            if self.json is None and nodes is None:
+                return
+            content = self.json.get("content") if isinstance(self.json, dict) else None
+            if (
+                not isinstance(content, list)
+                or len(content) != length
+                or not isinstance(nodes, list)
+                or len(nodes) != inserted
+            ):
+                raise ValueError("The patch does not apply to the editor's JSON")
+            self.json = {**self.json, "content": content[:start] + nodes + content[start + delete :]}
+
+        def _process_body(self, body):
             body = extract_images(body, self)
             body = clean_html(body)
             if settings.TEXT_AUTO_HYPHENATE:
@@ -91,16 +370,72 @@ if apps.is_installed("cms"):
                     body = hyphenate(body, language=self.language)
                 except (TypeError, CMSPlugin.DoesNotExist):
                     body = hyphenate(body)
-            self.body = body
+            return body
+
+        def save(self, *args, **kwargs):
+            adding = self._state.adding
+            original_body = self.body
 
+            # Embedded image plugins need a persisted parent. Existing text
+            # plugins can transform their body before their only write.
             if adding:
-                if body != original_body:
-                    super().save(update_fields=("body",))
-            else:
-                if kwargs.get("update_fields") is not None:
-                    kwargs["update_fields"] = set(kwargs["update_fields"]) | {"body"}
+                self.update_plain_text()
                 super().save(*args, **kwargs)
 
+            # Bodies patched by apply_body_patch() have been processed block by block
+            if self.body is not self._processed_body:
+                self.body = self._process_body(self.body)
+
+            if adding:
+                if self.body != original_body:
+                    self.update_plain_text()
+                    super().save(update_fields=("body", *self._plain_text_fields))
+            else:
+                self.update_plain_text()
+                update_fields = kwargs.get("update_fields")
+                if update_fields is not None:
+                    update_fields = {*update_fields, "body", *self._plain_text_fields}
+                    if self._versioned:
+                        update_fields.add("version")
+                    kwargs["update_fields"] = update_fields
+                if self.pk is None or kwargs.get("force_insert") or not self._versioned:
+                    super().save(*args, **kwargs)
+                    return
+                using = kwargs.get("using") or router.db_for_write(type(self), instance=self)
+                with transaction.atomic(using=using):
+                    if self._update_if_unchanged(using, update_fields):
+                        # The text row is written: the regular save is left with the parent (plugin) row and
+                        # the signals. A plugin changed through its text still gets a new changed_date.
+                        parent_fields = {
+                            field.name
+                            for field in self._meta.concrete_fields
+                            if not field.primary_key and field not in self._meta.local_concrete_fields
+                        }
+                        if update_fields is not None:
+                            parent_fields &= update_fields
+                        kwargs["update_fields"] = parent_fields or {"changed_date"}
+                    super().save(*args, **kwargs)
+
+        def _update_if_unchanged(self, using, update_fields=None):
+            """
+            Optimistic concurrency: writes the text row with ``UPDATE ... WHERE version = <loaded version>``
+            and increments the version. Raises TextVersionConflict if the text has been saved by someone
+            else since it was loaded, returns False if there is no row to update.
+            """
+            values = {
+                field.attname: field.pre_save(self, False)
+                for field in self._meta.local_concrete_fields
+                if not field.primary_key and (update_fields is None or field.name in update_fields)
+            }
+            values["version"] = self.version + 1
+            texts = type(self)._base_manager.using(using).filter(pk=self.pk)
+            if not texts.filter(version=self.version).update(**values):
+                if texts.exists():
+                    raise TextVersionConflict(f"Text {self.pk} has been changed since version {self.version}")
+                return False
+            self.version += 1
+            return True
+
         def clean_plugins(self):
             ids = self._get_inline_plugin_ids()
             unbound_plugins = self.cmsplugin_set.exclude(pk__in=ids)
@@ -109,21 +444,33 @@ if apps.is_installed("cms"):
             if hasattr(placeholder, "delete_plugins"):  # since CMS v5.1
                 placeholder.delete_plugins(unbound_plugins)
             elif hasattr(placeholder, "delete_plugin"):  # since CMS v4
-                # Delete via the placeholder so the remaining plugin positions are
-                # compacted, avoiding gaps that can later corrupt plugin positions
-                # (see django-cms#8665). delete_plugin() relies on the plugin's
-                # cached ``position``, so each plugin must be re-fetched right
-                # before deletion: a previous delete may have shifted it.
-                unbound_ids = list(unbound_plugins.values_list("pk", flat=True))
-                for pk in unbound_ids:
-                    plugin = self.cmsplugin_set.filter(pk=pk).first()
-                    if plugin is not None:  # may already be gone as a descendant
-                        placeholder.delete_plugin(plugin)
+                # Delete via the placeholder's plugin table so the remaining plugin
+                # positions are compacted, avoiding gaps that can later corrupt plugin
+                # positions (see django-cms#8665).
+                self._delete_plugins_in_bulk(placeholder, unbound_plugins.values_list("pk", flat=True))
             else:  # up to CMS v3.11
                 for plugin in unbound_plugins:
                     # delete plugins that are not referenced in the text anymore
                     plugin.delete()
 
+        def _delete_plugins_in_bulk(self, placeholder, plugin_ids):
+            """
+            Delete the given child plugins and all their descendants in a single query and
+            re-compact the placeholder's plugin positions once (CMS v4 up to v5.0).
+
+            The descendants of this text plugin are read once, so that the number of queries
+            does not depend on the number of plugins to delete.
+            """
+            if not plugin_ids:
+                return
+            with transaction.atomic():
+                descendants = CMSPlugin.objects.filter(pk__in=self._get_descendants_ids()).values_list(
+                    "pk", "parent_id"
+                )
+                to_delete = _add_descendants(plugin_ids, descendants)
+                placeholder.cmsplugin_set.filter(pk__in=to_delete).delete()
+                placeholder._recalculate_plugin_positions(self.language)
+
         def copy_referenced_plugins(self):
             if referenced_plugins := self.get_referenced_plugins():
                 plugin_pairs = []
@@ -143,6 +490,94 @@ if apps.is_installed("cms"):
                 self.add_existing_child_plugins_to_pairs(plugin_pairs)
                 self.post_copy(self, plugin_pairs)
 
+        @classmethod
+        def copy_referenced_plugins_in_bulk(cls, text_plugins):
+            """
+            Batched version of :meth:`copy_referenced_plugins` for many text plugins at once, e.g.,
+            when importing texts. The plugin admin calls :meth:`copy_referenced_plugins` for the one
+            text it saves.
+
+            All referenced plugins are fetched together. Their copies are inserted with one
+            ``bulk_create`` for the ``CMSPlugin`` table and one INSERT statement for each table of the
+            plugin models below it, and the positions of the other plugins are shifted with one
+            update per placeholder and language. The bodies are rewritten in memory and written with one bulk update.
+            As with ``bulk_create``, no ``pre_save``/``post_save`` signals are sent for the copies.
+            ``copy_relations`` is still called for each copy.
+
+            Requires django CMS v4+ and a database that returns primary keys from bulk inserts. Otherwise,
+            :meth:`copy_referenced_plugins` is called for each text plugin.
+            """
+            from cms.utils.plugins import downcast_plugins
+
+            text_plugins = list(text_plugins)
+            if not text_plugins:
+                return
+            if not (is_cms_v4 and connection.features.can_return_rows_from_bulk_insert):
+                for text_plugin in text_plugins:
+                    text_plugin.copy_referenced_plugins()
+                return
+
+            child_ids = defaultdict(set)
+            for parent_id, pk in CMSPlugin.objects.filter(parent__in=text_plugins).values_list("parent_id", "pk"):
+                child_ids[parent_id].add(pk)
+            referenced_ids = {
+                text_plugin.pk: [
+                    pk
+                    for pk in dict.fromkeys(plugin_tags_to_id_list(text_plugin.body))
+                    if pk not in child_ids[text_plugin.pk]
+                ]
+                for text_plugin in text_plugins
+            }
+            source_ids = {pk for ids in referenced_ids.values() for pk in ids}
+            if not source_ids:
+                return
+            sources = {
+                plugin.pk: plugin
+                for plugin in downcast_plugins(
+                    CMSPlugin.objects.filter(pk__in=source_ids | set().union(*child_ids.values()))
+                )
+            }
+
+            new_children = {}
+            for text_plugin in text_plugins:
+                pairs = []
+                for pk in referenced_ids[text_plugin.pk]:
+                    if pk in sources:
+                        new_plugin = deepcopy(sources[pk])
+                        new_plugin.pk = None
+                        new_plugin.id = None
+                        new_plugin._state.adding = True
+                        new_plugin.parent = text_plugin
+                        new_plugin.placeholder_id = text_plugin.placeholder_id
+                        new_plugin.language = text_plugin.language
+                        pairs.append((new_plugin, sources[pk]))
+                if pairs:
+                    new_children[text_plugin] = pairs
+            if not new_children:
+                return
+
+            with transaction.atomic():
+                _bulk_add_child_plugins({text_plugin: len(pairs) for text_plugin, pairs in new_children.items()})
+                for text_plugin, pairs in new_children.items():
+                    for offset, (new_plugin, _) in enumerate(pairs, start=1):
+                        new_plugin.position = text_plugin.position + offset
+                _bulk_insert_plugins([new_plugin for pairs in new_children.values() for new_plugin, _ in pairs])
+
+                updated = []
+                for text_plugin, pairs in new_children.items():
+                    for new_plugin, source_plugin in pairs:
+                        new_plugin.copy_relations(source_plugin)
+                    replace_ids = {pk: pk for pk in child_ids[text_plugin.pk]}
+                    plugins_by_id = {pk: sources[pk] for pk in child_ids[text_plugin.pk] if pk in sources}
+                    for new_plugin, source_plugin in pairs:
+                        replace_ids[source_plugin.pk] = new_plugin.pk
+                        plugins_by_id[new_plugin.pk] = new_plugin
+                    text_plugin.body = replace_plugin_tags(text_plugin.body, replace_ids, plugins_by_id=plugins_by_id)
+                    if cls._versioned:
+                        text_plugin.version += 1
+                    updated.append(text_plugin)
+                cls.objects.bulk_update(updated, ["body", "version"] if cls._versioned else ["body"])
+
         def get_referenced_plugins(self):
             ids_in_body = set(plugin_tags_to_id_list(self.body))
             child_plugins_ids = set(self.cmsplugin_set.all().values_list("id", flat=True))
@@ -154,16 +589,37 @@ if apps.is_installed("cms"):
                 plugins_pairs.append((plugin, plugin))
 
         def _get_inline_plugin_ids(self):
-            return plugin_tags_to_id_list(self.body)
+            # Memoized for the current body: clean_plugins() and the djangocms-history
+            # operation callbacks ask for the ids of the same body several times per save.
+            cached_body, ids = getattr(self, "_inline_plugin_ids", (None, None))
+            if cached_body is None or cached_body != self.body:
+                ids = plugin_tags_to_id_list(self.body)
+                self._inline_plugin_ids = (self.body, ids)
+            return list(ids)
 
         def post_copy(self, old_instance, ziplist):
             """
             Fix references to plugins
             """
             replace_ids = {old.pk: new.pk for new, old in ziplist}
-            old_text = old_instance.get_plugin_instance()[0].body
-            self.body = replace_plugin_tags(old_text, replace_ids)
-            self.save()
+            if isinstance(old_instance, AbstractText):
+                old_text = old_instance.body
+            else:
+                old_text = old_instance.get_plugin_instance()[0].body
+            self._replace_plugin_ids(old_text, replace_ids, plugins_by_id={new.pk: new for new, old in ziplist})
+
+        def _replace_plugin_ids(self, body, replace_ids, plugins_by_id=None):
+            """
+            Copy-specific write path: Set the body with its plugin ids replaced and only update the
+            body column. The body has been cleaned when it was saved, hence the full :meth:`save`
+            pipeline (image extraction, sanitizing, hyphenation) is not run again.
+            """
+            self.body = replace_plugin_tags(body, replace_ids, plugins_by_id=plugins_by_id)
+            values = {"body": self.body}
+            if self._versioned:
+                self.version += 1
+                values["version"] = self.version
+            type(self).objects.filter(pk=self.pk).update(**values)
 
         def notify_on_autoadd_children(self, request, conf, children):
             """
@@ -179,5 +635,45 @@ if apps.is_installed("cms"):
             self.save()
 
     class Text(AbstractText):
+        # Maintained by save() from the body, so that labels and search indexes need not strip the HTML
+        plain_text = models.TextField(_("plain text"), blank=True, default="", editable=False)
+        excerpt = models.CharField(_("excerpt"), blank=True, default="", max_length=_MAX_EXCERPT_LENGTH, editable=False)
+        # Change feed for search indexes: only changes of the plain text update the modified timestamp
+        content_hash = models.CharField(_("content hash"), blank=True, default="", max_length=64, editable=False)
+        modified = models.DateTimeField(_("modified"), blank=True, null=True, db_index=True, editable=False)
+        # Incremented by every save, which only succeeds if the stored version is the one loaded
+        version = models.PositiveIntegerField(_("version"), default=1, editable=False)
+
+        search_fields = ("plain_text",)
+        _plain_text_fields = ("plain_text", "excerpt", "content_hash", "modified")
+        _versioned = True
+
         class Meta:
             abstract = False
+
+        @classmethod
+        def iter_changes(cls, since=None, chunk_size=2000, overlap=None):
+            """
+            Streams ``(pk, language, placeholder_id, plain_text)`` for all texts whose plain text
+            changed at or after ``since`` (all texts if ``since`` is None), oldest changes first.
+
+            Rows are read in chunks of ``chunk_size`` using a server-side cursor where the database
+            supports it. To sync incrementally, take ``timezone.now()`` before consuming the
+            generator and pass it as ``since`` next time.
+
+            ``modified`` is set when a text is saved, not when its transaction commits. A text
+            committed after the cursor was taken can thus carry an older timestamp. Changes are
+            therefore re-read from ``since - overlap`` (a timedelta, defaults to
+            ``TEXT_CHANGE_FEED_OVERLAP`` seconds) and may be streamed more than once. Deleted texts
+            are not streamed at all.
+            """
+            queryset = cls.objects.all()
+            if since is not None:
+                if overlap is None:
+                    overlap = timedelta(seconds=settings.TEXT_CHANGE_FEED_OVERLAP)
+                queryset = queryset.filter(modified__gte=since - overlap)
+            yield from (
+                queryset.order_by("modified", "pk")
+                .values_list("pk", "language", "placeholder_id", "plain_text")
+                .iterator(chunk_size=chunk_size)
+            )
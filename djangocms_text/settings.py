@@ -40,6 +40,24 @@ TEXT_PLUGIN_NAME = getattr(settings, "TEXT_PLUGIN_NAME", _("Text"))
 TEXT_PLUGIN_MODULE_NAME = getattr(settings, "TEXT_PLUGIN_MODULE_NAME", _("Generic"))
 
 TEXT_INLINE_EDITING = getattr(settings, "TEXT_INLINE_EDITING", True)
+# Dotted path of a module generated by the text_inline_models management command
+TEXT_INLINE_MODELS_MODULE = getattr(settings, "TEXT_INLINE_MODELS_MODULE", None)
 TEXT_CHILDREN_ENABLED = getattr(settings, "TEXT_CHILDREN_ENABLED", True)
 TEXT_CHILDREN_WHITELIST = getattr(settings, "TEXT_CHILDREN_WHITELIST", None)
 TEXT_CHILDREN_BLACKLIST = getattr(settings, "TEXT_CHILDREN_BLACKLIST", [])
+# The text_delete_ghost_plugins command deletes text plugins left unsaved by the add view ("ghosts")
+# after this many seconds
+TEXT_GHOST_PLUGIN_MAX_AGE = getattr(settings, "TEXT_GHOST_PLUGIN_MAX_AGE", 24 * 60 * 60)
+# Action tokens (child plugin previews, cancelling the add view) expire after this many seconds (None: never)
+TEXT_ACTION_TOKEN_MAX_AGE = getattr(settings, "TEXT_ACTION_TOKEN_MAX_AGE", 12 * 60 * 60)
+TEXT_LAZY_CHILD_PREVIEWS = getattr(settings, "TEXT_LAZY_CHILD_PREVIEWS", False)
+# Text.iter_changes() re-reads changes from this many seconds before the cursor to catch late commits
+TEXT_CHANGE_FEED_OVERLAP = getattr(settings, "TEXT_CHANGE_FEED_OVERLAP", 5 * 60)
+# Inline editing sends changed blocks only instead of the whole text
+TEXT_INLINE_PATCH_SAVE = getattr(settings, "TEXT_INLINE_PATCH_SAVE", False)
+
+TEXT_LINK_PAGE_SIZE = getattr(settings, "TEXT_LINK_PAGE_SIZE", 50)
+TEXT_LINK_CACHE_TIMEOUT = getattr(settings, "TEXT_LINK_CACHE_TIMEOUT", 24 * 60 * 60)
+# Additional linkable models, e.g. [{"model": "shop.product", "search_fields": ("name", "sku")}]
+TEXT_LINK_PROVIDERS = getattr(settings, "TEXT_LINK_PROVIDERS", [])
+TEXT_LINK_SEARCH_BUDGET = getattr(settings, "TEXT_LINK_SEARCH_BUDGET", 0.5)
@@ -0,0 +1,68 @@
+from uuid import uuid4
+
+from django.apps import apps
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+
+LINK_SNAPSHOT_VERSION_KEY = "djangocms_text:link_snapshot_version"
+
+
+def get_link_snapshot_version() -> str:
+    """Return the current version of the cached page link snapshots."""
+    version = cache.get(LINK_SNAPSHOT_VERSION_KEY)
+    if version is None:
+        cache.add(LINK_SNAPSHOT_VERSION_KEY, uuid4().hex, timeout=None)
+        version = cache.get(LINK_SNAPSHOT_VERSION_KEY)
+    return version
+
+
+def invalidate_link_snapshots(**kwargs) -> None:
+    """Invalidate all cached page link snapshots (for all languages) by bumping their version."""
+    cache.set(LINK_SNAPSHOT_VERSION_KEY, uuid4().hex, timeout=None)
+
+
+def invalidate_link_snapshots_on_page_operation(operation, **kwargs) -> None:
+    from cms import operations
+
+    page_operations = {
+        getattr(operations, name, None)
+        for name in (
+            "CHANGE_PAGE",
+            "MOVE_PAGE",
+            "DELETE_PAGE",
+            "ADD_PAGE_TRANSLATION",
+            "CHANGE_PAGE_TRANSLATION",
+            "DELETE_PAGE_TRANSLATION",
+            "PUBLISH_PAGE_TRANSLATION",
+            "REVERT_PAGE_TRANSLATION_TO_LIVE",
+        )
+    }
+    if operation in page_operations:
+        invalidate_link_snapshots()
+
+
+def connect_link_snapshot_signals() -> None:
+    """Invalidate the page link snapshots whenever pages are changed, moved, published or unpublished."""
+    from cms.models import Page
+    from cms.signals import post_obj_operation
+
+    try:
+        from cms.models import PageContent
+    except ImportError:  # django CMS 3
+        from cms.models import Title as PageContent
+
+    for model in (Page, PageContent):
+        post_save.connect(
+            invalidate_link_snapshots, sender=model, dispatch_uid=f"djangocms_text_links_{model.__name__}"
+        )
+        post_delete.connect(
+            invalidate_link_snapshots, sender=model, dispatch_uid=f"djangocms_text_links_{model.__name__}"
+        )
+    post_obj_operation.connect(invalidate_link_snapshots_on_page_operation, dispatch_uid="djangocms_text_links")
+
+    if apps.is_installed("djangocms_versioning"):
+        from djangocms_versioning.signals import post_version_operation
+
+        post_version_operation.connect(
+            invalidate_link_snapshots, sender=PageContent, dispatch_uid="djangocms_text_links_versioning"
+        )
@@ -27,6 +27,7 @@ from packaging.version import Version
 OBJ_ADMIN_RE_PATTERN = r'<cms-plugin .*?\bid="(?P<pk>\d+)".*?>.*?</cms-plugin>'
 OBJ_ADMIN_WITH_CONTENT_RE_PATTERN = r'<cms-plugin .*?\bid="(?P<pk>\d+)".*?>(?P<content>.*?)</cms-plugin>'
 OBJ_ADMIN_RE = re.compile(OBJ_ADMIN_RE_PATTERN, flags=re.DOTALL)
+OBJ_ADMIN_WITH_CONTENT_RE = re.compile(OBJ_ADMIN_WITH_CONTENT_RE_PATTERN, flags=re.DOTALL)
 
 
 is_cms_v4 = Version(__version__) >= Version("3.9999")
@@ -73,7 +74,7 @@ def random_comment_exempt(view_func: callable) -> callable:
     return wraps(view_func, assigned=WRAPPER_ASSIGNMENTS)(wrapped_view)
 
 
-def plugin_to_tag(obj: CMSPlugin, content: str = "", admin: bool = False):
+def plugin_to_tag(obj: CMSPlugin, content: str = "", admin: bool = False, node: str | None = None):
     plugin_attrs = OrderedDict(
         id=obj.pk,
         icon_alt=force_escape(obj.get_instance_icon_alt()),
@@ -86,10 +87,12 @@ def plugin_to_tag(obj: CMSPlugin, content: str = "", admin: bool = False):
         preview = getattr(plugin_class, "text_editor_preview", True)
         plugin_tag = (
             '<cms-plugin render-plugin=%(preview)s alt="%(icon_alt)s" '
-            'title="%(icon_alt)s" id="%(id)d" type="%(type)s">%(content)s</cms-plugin>'
+            'title="%(icon_alt)s" id="%(id)d" type="%(type)s"%(node)s>%(content)s</cms-plugin>'
         )
         plugin_attrs["preview"] = "true" if preview else "false"
         plugin_attrs["type"] = plugin_class.__name__
+        # Without content, the editor cannot tell inline from block plugins by their markup
+        plugin_attrs["node"] = f' data-node="{node}"' if node else ""
     else:
         plugin_tag = '<cms-plugin alt="%(icon_alt)s" title="%(icon_alt)s" id="%(id)d">%(content)s</cms-plugin>'
     return plugin_tag % plugin_attrs
@@ -106,13 +109,17 @@ def plugin_tags_to_id_list(text, regex=OBJ_ADMIN_RE):
     return [int(_id) for _id in _find_plugins()]
 
 
-def _plugin_tags_to_html(text: str, output_func: callable, child_plugin_instances: list[CMSPlugin] | None) -> str:
+def _plugin_tags_to_html(
+    text: str, output_func: callable, child_plugin_instances: list[CMSPlugin] | dict[int, CMSPlugin] | None
+) -> str:
     """
     Convert plugin object 'tags' into the form for public site.
 
     context is the template context to use, placeholder is the placeholder name
     """
-    if child_plugin_instances is not None:
+    if isinstance(child_plugin_instances, dict):
+        plugins_by_id = child_plugin_instances
+    elif child_plugin_instances is not None:
         plugins_by_id = {plugin.pk: plugin for plugin in child_plugin_instances}
     else:
         plugins_by_id = get_plugins_from_text(text)
@@ -154,10 +161,20 @@ def plugin_tags_to_db(text: str) -> str:
     return _plugin_tags_to_html(text, output_func=_strip_plugin_content, child_plugin_instances=None)
 
 
-def replace_plugin_tags(text: str, id_dict, regex: str = OBJ_ADMIN_RE) -> str:
-    from cms.models import CMSPlugin
+def replace_plugin_tags(
+    text: str, id_dict, regex: str = OBJ_ADMIN_RE, plugins_by_id: dict[int, CMSPlugin] | None = None
+) -> str:
+    """
+    Replace the plugin ids in the plugin tags of ``text`` according to ``id_dict``. Tags of plugins
+    not in ``id_dict`` are removed.
+
+    ``plugins_by_id`` optionally maps the new ids to (downcasted) plugin instances already in memory;
+    otherwise they are fetched from the database.
+    """
+    if plugins_by_id is None:
+        from cms.models import CMSPlugin
 
-    plugins_by_id = CMSPlugin.objects.in_bulk(id_dict.values())
+        plugins_by_id = CMSPlugin.objects.in_bulk(id_dict.values())
 
     def _replace_tag(m):
         try:
@@ -175,10 +192,15 @@ def replace_plugin_tags(text: str, id_dict, regex: str = OBJ_ADMIN_RE) -> str:
 
 
 def get_plugins_from_text(text, regex=OBJ_ADMIN_RE):
+    return get_plugins_from_texts([text], regex)
+
+
+def get_plugins_from_texts(texts, regex=OBJ_ADMIN_RE):
+    """Returns the (downcasted) plugins referenced in any of the given texts by their ids."""
     from cms.models import CMSPlugin
     from cms.utils.plugins import downcast_plugins
 
-    plugin_ids = plugin_tags_to_id_list(text, regex)
+    plugin_ids = {pk for text in texts for pk in plugin_tags_to_id_list(text, regex)}
     plugins = CMSPlugin.objects.filter(pk__in=plugin_ids).select_related("placeholder")
     plugin_list = downcast_plugins(plugins, select_placeholder=True)
     return {plugin.pk: plugin for plugin in plugin_list}
@@ -192,6 +192,8 @@ class CMSEditor {
         this._editor_settings = {};
         this._generic_editors = {};
         this._pendingSaves = new Set();
+        // Version of each inline text plugin as last saved (and its top-level HTML blocks for patch saves)
+        this._savedTexts = new WeakMap();
         this._admin_selector = 'textarea.CMS_Editor';
         this._admin_add_row_selector = 'body.change-form .add-row a';
         this._inline_admin_selector = 'body.change-form .form-row';
@@ -646,18 +648,33 @@ class CMSEditor {
                 csrfmiddlewaretoken: csrf,
                 _save: 'Save'
             };
+            let blocks = null;
+            let version = null;
+            let patchSave = false;
             if (field && el.dataset.cmsType !== 'HTMLField') {
                 // CharField: use plain textContent, no editor plugin involved
                 data[field] = el.textContent;
             } else {
                 // TextPlugin or HTMLField: get data from the editor plugin
                 const html = window.cms_editor_plugin.getHTML(el);
-                const json = window.cms_editor_plugin.getJSON(el);
                 if (field) {
                     data[field] = html;
                 } else {
-                    data.body = html;
-                    data.json = json ? JSON.stringify(json) : '';
+                    const json = window.cms_editor_plugin.getJSON(el);
+                    blocks = this._splitBlocks(html);
+                    const patch = this._getBodyPatch(el, blocks, json);
+                    if (patch) {
+                        data.body_patch = JSON.stringify(patch);
+                    } else {
+                        data.body = html;
+                        data.json = json ? JSON.stringify(json) : '';
+                        // The server refuses the save if someone else saved the text in the meantime
+                        const saved = this._savedTexts.get(el);
+                        const loadedVersion = saved ? saved.version : this.getSettings(el).version;
+                        if (loadedVersion) {
+                            data.version = loadedVersion;
+                        }
+                    }
                 }
             }
 
@@ -666,6 +683,27 @@ class CMSEditor {
                 body: new URLSearchParams(data),
             })
                 .then(response => {
+                        if (response.status === 409 && data.body_patch) {
+                            // The patch does not apply: send the whole text (which fails as well if the text
+                            // has been changed elsewhere in the meantime)
+                            this._savedTexts.set(el, {blocks: null, version: this._savedTexts.get(el).version});
+                            el.dataset.changed = 'true';
+                            return this.saveData(el, action).then(() => null);
+                        }
+                        if (response.status === 409) {
+                            el.dataset.changed = 'true';
+                            if (this.CMS) {
+                                this.CMS.API.Toolbar.hideLoader();
+                            }
+                            return response.text().then(message => {
+                                if (this.CMS) {
+                                    this.CMS.API.Messages.open({message: message, error: true, delay: -1});
+                                }
+                                return null;
+                            });
+                        }
+                        version = response.headers.get('X-Text-Version');
+                        patchSave = response.headers.get('X-Text-Patch-Save') === 'true';
                         if (action !== undefined) {
                             action(el, response);
                         }
@@ -674,6 +712,9 @@ class CMSEditor {
                         }
                         return response.text();
                 }).then(body => {
+                    if (body === null) {
+                        return;  // Saved again without a patch, or refused
+                    }
                     // If the edited field does not force a reload, read the CMS databridge values from the response,
                     // either directly or from a script tag or from the response using regex.
                     // This depends on the exact format django CMS core returns it. This will need to be adjusted
@@ -740,6 +781,9 @@ class CMSEditor {
 
                     }
                     el.dataset.changed = 'false';
+                    if (blocks && version) {
+                        this._savedTexts.set(el, {blocks: patchSave ? blocks : null, version: version});
+                    }
                     this.processDataBridge(dom);
                     if (!this.CMS.API.Helpers.dataBridge) {
                         // No databridge found
@@ -784,6 +828,79 @@ class CMSEditor {
         return Promise.resolve();
     }
 
+    // CMS Editor: _splitBlocks
+    // Split the editor's HTML into its top-level nodes (the server splits the saved text the same way)
+    _splitBlocks(html) {
+        const template = document.createElement('template');
+        template.innerHTML = html;
+        const wrapper = document.createElement('div');
+        return Array.from(template.content.childNodes)
+            .filter(node => node.nodeType === Node.ELEMENT_NODE || node.nodeType === Node.TEXT_NODE)
+            .map(node => {
+                if (node.nodeType === Node.ELEMENT_NODE) {
+                    return node.outerHTML;
+                }
+                wrapper.textContent = node.textContent;
+                return wrapper.innerHTML;
+            });
+    }
+
+    // CMS Editor: _getBlockHash
+    // 32-bit FNV-1a hash of the text of a block, ignoring markup, child plugin previews, soft hyphens and
+    // whitespace (see djangocms_text.html.get_block_hash), so that it matches the sanitized block on the server
+    _getBlockHash(block) {
+        const template = document.createElement('template');
+        template.innerHTML = block;
+        template.content.querySelectorAll('cms-plugin').forEach(plugin => plugin.replaceChildren());
+        const text = template.content.textContent.replace(/\u00ad/g, '').replace(/\s+/g, '');
+        let value = 0x811c9dc5;
+        for (const char of text) {
+            value = Math.imul(value ^ char.codePointAt(0), 0x01000193) >>> 0;
+        }
+        return value;
+    }
+
+    // CMS Editor: _getBodyPatch
+    // Returns the changed top-level blocks since the last save as a patch against the saved version, or null
+    // if the whole text needs to be sent (first save, or the server does not accept patches). The patch carries
+    // the hashes of the replaced blocks and their neighbours, and the editor's JSON nodes of the inserted blocks.
+    _getBodyPatch(el, blocks, json) {
+        const saved = this._savedTexts.get(el);
+        if (!saved || !saved.blocks) {
+            return null;
+        }
+        const nodes = json && Array.isArray(json.content) ? json.content : null;
+        if (json && (!nodes || nodes.length !== blocks.length)) {
+            // The JSON nodes cannot be matched with the blocks
+            return null;
+        }
+        const old = saved.blocks;
+        let start = 0;
+        while (start < old.length && start < blocks.length && old[start] === blocks[start]) {
+            start++;
+        }
+        let end = 0;
+        while (
+            end < old.length - start &&
+            end < blocks.length - start &&
+            old[old.length - 1 - end] === blocks[blocks.length - 1 - end]
+        ) {
+            end++;
+        }
+        const patch = {
+            version: saved.version,
+            length: old.length,
+            start: start,
+            delete: old.length - start - end,
+            insert: blocks.slice(start, blocks.length - end),
+            hashes: old.slice(Math.max(start - 1, 0), old.length - end + 1).map(block => this._getBlockHash(block)),
+        };
+        if (nodes) {
+            patch.json_insert = nodes.slice(start, nodes.length - end);
+        }
+        return patch;
+    }
+
     /**
      * Are there inline editors with changes that have not been sent to the server yet?
      *
@@ -935,6 +1052,26 @@ class CMSEditor {
             });
      }
 
+    // CMS Editor: requestPluginsMarkup
+    // Get HTML markup for several child plugins in one request: resolves to an object mapping plugin ids to markup
+    requestPluginsMarkup (plugin_ids, el) {
+        const settings = this.getSettings(el);
+        const data = {
+            plugins: plugin_ids.join(','),
+            token: settings.action_token,
+        };
+
+        const url = `${settings.render_plugin_url}?${new URLSearchParams(data).toString()}`;
+
+        return fetch(url, {method: 'GET'})
+            .then(response => {
+                if (response.status === 200) {
+                    return response.json().then(data => data.plugins);
+                }
+                return {};
+            });
+    }
+
     // CMS Editor: resetInlineEditors
     _resetInlineEditors () {
         // Destroy editors whose DOM elements are no longer in the document
@@ -2,6 +2,8 @@
 /* jshint esversion: 11 */
 /* global document, window, console */
 
+// References waiting to be resolved, per endpoint URL
+const pendingReferences = new Map();
 
 class LinkField {
     constructor(element, options) {
@@ -213,8 +215,7 @@ class LinkField {
 
     handleChange(event) {
         if (this.selectElement.value && this.options.url) {
-            fetch(this.options.url + (this.options.url.includes('?') ? '&g=' : '?g=') + encodeURIComponent(this.selectElement.value))
-                .then(response => response.json())
+            LinkField.resolveReference(this.options.url, this.selectElement.value)
                 .then(data => {
                     this.inputElement.value = data.text;
                     this.inputElement.classList.add('cms-linkfield-selected');
@@ -223,6 +224,24 @@ class LinkField {
         }
     }
 
+    static resolveReference(url, reference) {
+        // Link fields created together (e.g., all links of a form) resolve their references with one request
+        let batch = pendingReferences.get(url);
+        if (!batch) {
+            batch = {references: new Set()};
+            batch.results = new Promise(resolve => setTimeout(resolve)).then(() => {
+                pendingReferences.delete(url);
+                const refs = encodeURIComponent([...batch.references].join(','));
+                return fetch(url + (url.includes('?') ? '&refs=' : '?refs=') + refs)
+                    .then(response => response.json())
+                    .then(data => data.results || {});
+            });
+            pendingReferences.set(url, batch);
+        }
+        batch.references.add(reference);
+        return batch.results.then(results => results[reference] || {});
+    }
+
     search(page = 1) {
         this.openDropdown();
         const searchText = this.inputElement.value.toLowerCase();
@@ -144,6 +144,63 @@ function renderCmsPluginMenu(editor, item, filter) {
 
 TiptapToolbar.CMSPlugins.render = renderCmsPluginMenu;
 
+
+const pendingPreviews = new WeakMap();
+
+/**
+ * Lazily load the preview of a child plugin which was shipped without content
+ * (see TEXT_LAZY_CHILD_PREVIEWS). All previews requested while the document is
+ * rendered are fetched in one request and then replace their nodes.
+ */
+function loadPluginPreview(editor, id) {
+    'use strict';
+
+    let pending = pendingPreviews.get(editor);
+    if (!pending) {
+        pending = new Set();
+        pendingPreviews.set(editor, pending);
+        setTimeout(() => {
+            pendingPreviews.delete(editor);
+            window.CMS_Editor.requestPluginsMarkup(Array.from(pending), editor.options.el)
+                .then(markups => {
+                    const transaction = editor.state.tr;
+                    editor.state.doc.descendants((node, position) => {
+                        const markup = markups[node.attrs.HTMLAttributes?.id];
+                        if (!markup || node.attrs.HTMLContent) {
+                            return;
+                        }
+                        const ghost = document.createElement("div");
+                        ghost.innerHTML = markup;
+                        const plugin = ghost.firstChild;  // cms-plugin tag
+
+                        let attrs = {};
+                        Array.from(plugin.attributes).forEach(attr => {
+                            attrs[attr.name] = attr.value;
+                        });
+                        // Keep the node type: the server sent it with the empty tag (data-node) and
+                        // changing it could make the document invalid (e.g., a block in a paragraph)
+                        attrs["data-node"] = node.type.name;
+                        transaction.setNodeMarkup(position, node.type, {
+                            HTMLAttributes: attrs,
+                            HTMLContent: plugin.innerHTML,
+                            type: attrs.type
+                        });
+                    });
+                    if (transaction.docChanged) {
+                        // Loading previews is not a change of the text
+                        const changed = editor.options.el.dataset.changed;
+                        editor.view.dispatch(transaction.setMeta('addToHistory', false));
+                        editor.options.el.dataset.changed = changed;
+                    }
+                })
+                .catch(error => {
+                    console.warn(error);
+                });
+        }, 0);
+    }
+    pending.add(id);
+}
+
 // Common node properties for both inline and block nodes
 const cmsPluginNodes = {
     atom: true,
@@ -177,7 +234,9 @@ const cmsPluginNodes = {
                     Array.from(dom.attributes).forEach(attr => {
                         attrs[attr.name] = attr.value;
                     });
-                    if (getNodeType(dom.firstElementChild) !== this.name) {
+                    // Empty tags (lazy previews) carry their node type
+                    const nodeType = dom.getAttribute('data-node') || getNodeType(dom.firstElementChild);
+                    if (nodeType !== this.name) {
                         // Node types need to match
                         return false;
                     }
@@ -210,7 +269,11 @@ const cmsPluginNodes = {
 
             // insert HTML
             if (node.attrs.HTMLAttributes["render-plugin"] === "true") {
-                dom.innerHTML = node.attrs.HTMLContent;
+                if (node.attrs.HTMLContent) {
+                    dom.innerHTML = node.attrs.HTMLContent;
+                } else if (node.attrs.HTMLAttributes.id) {
+                    loadPluginPreview(editor, node.attrs.HTMLAttributes.id);
+                }
             }
             // add attributes
             for (const [attr, value] of Object.entries(node.attrs.HTMLAttributes)) {
@@ -5,7 +5,7 @@ from cms.utils.plugins import get_plugin_model
 from django.template import engines
 
 from djangocms_text.cms_plugins import TextPlugin
-from tests.test_app.models import DummyLink, DummySpacer
+from tests.test_app.models import CustomText, DummyLink, DummySpacer
 
 
 @plugin_pool.register_plugin
@@ -28,6 +28,12 @@ class ExtendedTextPlugin(TextPlugin):
     name = "Extended"
 
 
+@plugin_pool.register_plugin
+class CustomTextPlugin(TextPlugin):
+    name = "Custom text"
+    model = CustomText
+
+
 @plugin_pool.register_plugin
 class DummyLinkPlugin(CMSPluginBase):
     render_plugin = False
@@ -5,6 +5,10 @@ try:
 except ModuleNotFoundError:
     from django.db.models import Model as CMSPlugin
 
+    AbstractText = None
+else:
+    from djangocms_text.models import AbstractText
+
 from djangocms_text.fields import HTMLField
 
 
@@ -30,6 +34,15 @@ class DummySpacer(CMSPlugin):
         return "dummy spacer object"
 
 
+if AbstractText is not None:
+
+    class CustomText(AbstractText):
+        """A text model of another app: its table has none of the fields that ``Text`` adds"""
+
+        class Meta:
+            abstract = False
+
+
 class Pizza(models.Model):
     description = HTMLField()
     allergens = HTMLField(blank=True)
@@ -1,10 +1,15 @@
+import os
+import sys
 from importlib import import_module
+from tempfile import TemporaryDirectory
 from types import SimpleNamespace
 from unittest import skipIf
 from unittest.mock import patch
 
 from django import forms
 from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
 from django.test import SimpleTestCase
 
 from djangocms_text.apps import (
@@ -24,17 +29,22 @@ def _make_model(app_label: str, model_name: str):
 
 @skipIf(settings.CMS_NOT_USED, "Skipping app tests because djangocms is not installed")
 class AppsConfigTestCase(SimpleTestCase):
-    def test_ready_populates_inline_models_and_registers_checks(self):
+    def test_ready_registers_checks_and_discovers_inline_models_lazily(self):
         app_config = TextConfig("djangocms_text", import_module("djangocms_text"))
         expected_inline_models = {"tests-sample-field": "CharField"}
 
         with (
-            patch("djangocms_text.apps.discover_inline_editable_models", return_value=expected_inline_models),
+            patch(
+                "djangocms_text.apps.discover_inline_editable_models", return_value=expected_inline_models
+            ) as discover_mock,
             patch("djangocms_text.apps.register") as register_mock,
         ):
             app_config.ready()
+            discover_mock.assert_not_called()
+            self.assertEqual(app_config.inline_models, expected_inline_models)
+            self.assertEqual(app_config.inline_models, expected_inline_models)
 
-        self.assertEqual(app_config.inline_models, expected_inline_models)
+        discover_mock.assert_called_once_with()
         self.assertEqual(register_mock.call_count, 2)
         register_mock.assert_any_call(check_ckeditor_settings)
         register_mock.assert_any_call(check_no_cms_config)
@@ -157,3 +167,37 @@ class DiscoverInlineEditableModelsTestCase(SimpleTestCase):
             inline_models = discover_inline_editable_models()
 
         self.assertEqual(inline_models, {"tests-standalonemodel-text": "CharField"})
+
+
+@skipIf(settings.CMS_NOT_USED, "Skipping app tests because djangocms is not installed")
+class InlineModelsModuleTestCase(SimpleTestCase):
+    def test_management_command_generates_inline_models_module(self):
+        expected_inline_models = {"tests-sample-field": "CharField"}
+
+        with TemporaryDirectory() as directory:
+            with patch(
+                "djangocms_text.management.commands.text_inline_models.discover_inline_editable_models",
+                return_value=expected_inline_models,
+            ):
+                call_command("text_inline_models", output=os.path.join(directory, "generated_inline_models.py"))
+
+            app_config = TextConfig("djangocms_text", import_module("djangocms_text"))
+            with (
+                patch.object(sys, "path", [directory, *sys.path]),
+                patch.dict(sys.modules),
+                patch("djangocms_text.settings.TEXT_INLINE_MODELS_MODULE", "generated_inline_models"),
+                patch("djangocms_text.apps.discover_inline_editable_models") as discover_mock,
+            ):
+                self.assertEqual(app_config.inline_models, expected_inline_models)
+        discover_mock.assert_not_called()
+
+    def test_misconfigured_inline_models_module_raises(self):
+        app_config = TextConfig("djangocms_text", import_module("djangocms_text"))
+
+        with (
+            patch("djangocms_text.settings.TEXT_INLINE_MODELS_MODULE", "does_not_exist.inline_models"),
+            patch("djangocms_text.apps.discover_inline_editable_models") as discover_mock,
+            self.assertRaisesMessage(ImproperlyConfigured, "'does_not_exist.inline_models'"),
+        ):
+            app_config.inline_models  # noqa: B018
+        discover_mock.assert_not_called()
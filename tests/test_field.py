@@ -1,10 +1,33 @@
+import json
+import pickle
+import re
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.db.models import CharField, TextField
+from django.forms import modelform_factory
 from django.template import Context, Template
 from django.test import override_settings
-from django.utils.safestring import SafeData
-
-from djangocms_text.fields import HTMLField, HTMLFormField
+from django.utils.safestring import SafeData, SafeString
+
+from djangocms_text.fields import (
+    HTMLField,
+    HTMLFieldQuerySet,
+    HTMLFormField,
+    LazyHTML,
+    resolve_html_references,
+    sanitize_and_mark_safe,
+)
+from djangocms_text.html import SanitizedHTML, cms_parser, get_data_from_db
 from djangocms_text.widgets import TextEditorWidget
 
+try:
+    from cms.api import create_page
+
+    SKIP_CMS_TEST = False
+except ModuleNotFoundError:
+    SKIP_CMS_TEST = True
+
 from .base import BaseTestCase
 from .test_app.forms import SimpleTextForm
 from .test_app.models import SimpleText
@@ -95,3 +118,123 @@ class FieldTestCase(BaseTestCase):
         self.assertTrue(form.is_valid())
 
         self.assertEqual(form.cleaned_data["text"], self.text_normal)
+
+    def test_model_form_save_sanitizes_once(self):
+        import nh3
+
+        with patch("nh3.clean", wraps=nh3.clean) as nh3_clean:
+            form = modelform_factory(SimpleText, fields=["text"])(data={"text": self.text_with_script})
+            self.assertTrue(form.is_valid())
+            obj = form.save()
+
+        self.assertEqual(nh3_clean.call_count, 1)
+        self.assertIsInstance(obj.text, SanitizedHTML)
+        self.assertEqual(SimpleText.objects.get(pk=obj.pk).text, self.text_normal)
+
+    def test_sanitized_html_is_sanitized_again_after_configuration_change(self):
+        value = sanitize_and_mark_safe(self.text_normal)
+
+        self.assertIs(sanitize_and_mark_safe(value), value)
+        with patch.object(cms_parser, "version", cms_parser.version + 1):
+            self.assertIsNot(sanitize_and_mark_safe(value), value)
+
+
+@skipIf(SKIP_CMS_TEST, "Skipping tests because djangocms is not installed")
+class LazyHTMLTestCase(BaseTestCase):
+    def test_model_field_resolves_references_lazily(self):
+        page = create_page("page", "page.html", language="en")
+        SimpleText.objects.create(text=f'<a data-cms-href="cms.page:{page.pk}" href="/old/">Link</a>')
+
+        with self.assertNumQueries(1):
+            text = SimpleText.objects.get()
+
+        self.assertIsInstance(text.__dict__["text"], LazyHTML)
+        rendered = Template("{{ obj.text }}").render(Context({"obj": text}))
+        self.assertIn('href="/en/page/"', rendered)
+        self.assertNotIn("&lt;", rendered)
+        # Once accessed, the value is a plain safe string
+        self.assertIs(type(text.text), SafeString)
+        self.assertNotIsInstance(text.__dict__["text"], LazyHTML)
+
+    def test_lazy_value_is_a_string(self):
+        page = create_page("page", "page.html", language="en")
+        SimpleText.objects.create(text=f'<a data-cms-href="cms.page:{page.pk}" href="/old/">Link</a>')
+        text = SimpleText.objects.get()
+        loaded = SimpleText.objects.values_list("text", flat=True).get()
+
+        self.assertIsInstance(loaded, str)
+        self.assertIn('href="/en/page/"', str(loaded))
+        for value in (text.text, loaded):
+            self.assertIsInstance(value, str)
+            # Assignment to other model fields, JSON serialization and regular expressions
+            self.assertIn("data-cms-href", CharField().get_prep_value(value))
+            self.assertIn("data-cms-href", TextField().get_prep_value(value))
+            self.assertIn("data-cms-href", json.loads(json.dumps({"text": value}))["text"])
+            self.assertEqual(re.sub("Link", "Page", value).count("Page"), 1)
+
+    def test_unaccessed_value_is_saved_without_resolving(self):
+        page = create_page("page", "page.html", language="en")
+        SimpleText.objects.create(text=f'<a data-cms-href="cms.page:{page.pk}" href="/old/">Link</a>')
+        text = SimpleText.objects.get()
+
+        with patch("djangocms_text.fields.render_dynamic_attributes") as render:
+            text.save()
+        render.assert_not_called()
+        self.assertIsInstance(pickle.loads(pickle.dumps(text)).__dict__["text"], LazyHTML)
+
+    def test_resolve_html_references_in_bulk(self):
+        pages = [create_page(f"page {i}", "page.html", language="en") for i in range(3)]
+        for page in pages:
+            SimpleText.objects.create(text=f'<a data-cms-href="cms.page:{page.pk}">Link</a>')
+        SimpleText.objects.create(text="<p>No references</p>")
+        texts = list(SimpleText.objects.order_by("pk"))
+
+        with patch("djangocms_text.fields.get_data_from_db", wraps=get_data_from_db) as get_data:
+            resolve_html_references(texts, "text")
+
+        get_data.assert_called_once_with({"cms.page": {page.pk for page in pages}})
+        self.assertFalse(any(isinstance(text.__dict__["text"], LazyHTML) for text in texts))
+        self.assertIn(f'href="{pages[1].get_absolute_url("en")}"', texts[1].text)
+        self.assertEqual(texts[3].text, "<p>No references</p>")
+
+    def test_queryset_resolves_html_references(self):
+        pages = [create_page(f"page {i}", "page.html", language="en") for i in range(3)]
+        for page in pages:
+            SimpleText.objects.create(text=f'<a data-cms-href="cms.page:{page.pk}">Link</a>')
+        queryset = HTMLFieldQuerySet(model=SimpleText).order_by("pk")
+
+        with patch("djangocms_text.fields.get_data_from_db", wraps=get_data_from_db) as get_data:
+            texts = list(queryset.resolve_html_references("text").filter(pk__gt=0))
+
+        get_data.assert_called_once_with({"cms.page": {page.pk for page in pages}})
+        self.assertFalse(any(isinstance(text.__dict__["text"], LazyHTML) for text in texts))
+
+    def test_queryset_resolves_values_rows(self):
+        pages = [create_page(f"page {i}", "page.html", language="en") for i in range(3)]
+        for page in pages:
+            SimpleText.objects.create(text=f'<a data-cms-href="cms.page:{page.pk}" href="/old/">Link</a>')
+        queryset = HTMLFieldQuerySet(model=SimpleText).order_by("pk").resolve_html_references()
+        expected = [
+            f'<a data-cms-href="cms.page:{page.pk}" href="{page.get_absolute_url("en")}">Link</a>' for page in pages
+        ]
+
+        # Without resolving, values_list() returns the stored HTML to anything but rendering and str()
+        stored = json.loads(json.dumps(list(SimpleText.objects.values_list("text", flat=True))))
+        self.assertTrue(all('href="/old/"' in value for value in stored))
+
+        with patch("djangocms_text.fields.get_data_from_db", wraps=get_data_from_db) as get_data:
+            flat = list(queryset.values_list("text", flat=True))
+        get_data.assert_called_once_with({"cms.page": {page.pk for page in pages}})
+
+        rows = {
+            "flat": flat,
+            "tuples": [text for (text,) in queryset.values_list("text")],
+            "named": [row.text for row in queryset.values_list("text", named=True)],
+            "dicts": [row["text"] for row in queryset.values("text")],
+        }
+        for kind, values in rows.items():
+            with self.subTest(kind):
+                self.assertFalse(any(isinstance(value, LazyHTML) for value in values))
+                self.assertEqual(values, expected)
+                self.assertEqual(json.loads(json.dumps(values)), expected)
+                self.assertEqual(len(values[0]), len(expected[0]))
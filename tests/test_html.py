@@ -1,4 +1,6 @@
 import copy
+import subprocess
+import sys
 from unittest import skipIf
 from unittest.mock import MagicMock, patch
 
@@ -14,7 +16,9 @@ try:
         NH3Parser,
         dynamic_href,
         dynamic_src,
+        get_block_hash,
         get_data_from_db,
+        get_plugin_node_types,
         get_xpath,
         render_dynamic_attributes,
     )
@@ -64,6 +68,29 @@ class SanitizerTestCase(TestCase):
         # Restore the original global settings.
         settings.TEXT_ADDITIONAL_ATTRIBUTES = original_global_attributes
 
+    def test_plugin_node_types(self):
+        body = (
+            '<p>Inline <cms-plugin id="1"></cms-plugin></p>'
+            '<cms-plugin id="2"></cms-plugin>'
+            '<ul><li><cms-plugin id="3"></cms-plugin></li><li><p><b><cms-plugin id="4"></cms-plugin></b></p></li></ul>'
+            'Top-level text <cms-plugin id="5"></cms-plugin>'
+            '<div></div><cms-plugin id="6"></cms-plugin> and text after it'
+        )
+        self.assertEqual(
+            get_plugin_node_types(body),
+            {1: "cmsPlugin", 2: "cmsBlockPlugin", 3: "cmsBlockPlugin", 4: "cmsPlugin", 5: "cmsPlugin", 6: "cmsPlugin"},
+        )
+
+    def test_block_hash(self):
+        # The stored block and the editor's block (with the child plugin's preview) have the same hash
+        self.assertEqual(
+            get_block_hash('<p>Caf&eacute; cr&shy;oissant <cms-plugin id="1"></cms-plugin></p>'),
+            get_block_hash('<p class="lead">Café\n croissant <cms-plugin id="1"><a href="/">Link</a></cms-plugin></p>'),
+        )
+        # Computed by cms.editor.js for the same block
+        self.assertEqual(get_block_hash("<p>Café croissant</p>"), 0x3F98265C)
+        self.assertNotEqual(get_block_hash("<p>One</p>"), get_block_hash("<p>Two</p>"))
+
 
 @skipIf(SKIP_CMS_TEST, "Skipping tests because djangocms is not installed")
 class HtmlSanitizerAdditionalProtocolsTests(CMSTestCase):
@@ -288,6 +315,24 @@ class DynamicAttributesTestCase(TestCase):
 
         self.assertEqual(result, {"unknown.model": {}})
 
+    def test_get_data_from_db_uses_link_provider(self):
+        from django.contrib.auth.models import User
+
+        from djangocms_text import links
+
+        user = User.objects.create(username="linked")
+        provider = links.LinkProvider("auth.user", search_fields=("username",), url_builder=lambda obj: "/users/")
+        with (
+            patch.dict(links.link_providers, {"auth.user": provider}),
+            patch.object(provider, "resolve", wraps=provider.resolve) as resolve,
+        ):
+            result = get_data_from_db({"auth.user": {user.pk}})
+            updated_html = render_dynamic_attributes(f'<a data-cms-href="auth.user:{user.pk}">Link</a>')
+
+        self.assertEqual(result, {"auth.user": {user.pk: user}})
+        resolve.assert_called_with({user.pk}, admin_objects=False)
+        self.assertIn('<a href="/users/">Link</a>', updated_html)
+
     def test_render_dynamic_attributes_changes_html(self):
         page = create_page("page", "page.html", language="en")
         html = f'<a data-cms-href="cms.page:{page.pk}">Link</a>'
@@ -406,3 +451,22 @@ class DjangoCMSPictureIntegrationTestCase(CMSTestCase):
 
         with patch.object(settings, "TEXT_SAVE_IMAGE_FUNCTION", None):
             self.assertEqual(html.extract_images(body, plugin=None), body)
+
+
+class LazyImportTestCase(TestCase):
+    def test_heavy_dependencies_are_imported_on_first_use(self):
+        # Runs in a fresh interpreter, since the test run itself has long imported all of them
+        script = (
+            "import sys\n"
+            "from django.conf import settings\n"
+            "settings.configure()\n"
+            "import djangocms_text.html as html\n"
+            "heavy = ('lxml', 'nh3', 'html5lib', 'PIL')\n"
+            "print(sorted(name for name in heavy if name in sys.modules))\n"
+            "html.clean_html('<p>text</p>')\n"
+            "html.render_dynamic_attributes('<a data-cms-href=\"a.b:1\">link</a>')\n"
+            "print(sorted(name for name in heavy if name in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+
+        self.assertEqual(result.stdout.splitlines(), ["[]", "['lxml', 'nh3']"])
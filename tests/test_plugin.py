@@ -1,22 +1,31 @@
 import copy
+import io
 import json
 import re
+import sys
+import types
 import unittest
+from datetime import timedelta
 from unittest import skipIf
 from unittest.mock import MagicMock, patch
 from urllib.parse import unquote
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib import admin
 from django.contrib.auth import get_permission_codename
 from django.contrib.auth.models import Permission
+from django.core import signing
 from django.core.exceptions import PermissionDenied
-from django.db import connection
+from django.core.management import call_command
+from django.db import connection, transaction
 from django.template import RequestContext
 from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.utils.encoding import force_str
 from django.utils.html import escape
 from django.utils.http import urlencode
+from django.utils.translation import override
 
 from .fixtures import DJANGO_CMS4, DJANGOCMS_VERSIONING, TestFixture
 
@@ -27,10 +36,19 @@ try:
         from cms.api import add_plugin
         from cms.api import create_title as create_page_content
     from cms.models import CMSPlugin, Page, Placeholder
+    from cms.plugin_base import CMSPluginBase
     from cms.utils.urlutils import admin_reverse
 
-    from djangocms_text.cms_plugins import TextPlugin
-    from djangocms_text.models import Text
+    from djangocms_text.cms_plugins import (
+        TextPlugin,
+        _child_plugin_menus,
+        _get_parent_plugins,
+        _get_static_body_css_classes,
+        clear_child_plugin_menus,
+    )
+    from djangocms_text.forms import ActionTokenValidationForm, _verify_action_token
+    from djangocms_text.html import clean_html, get_block_hash
+    from djangocms_text.models import Text, TextVersionConflict, get_plain_text
     from djangocms_text.utils import (
         _plugin_tags_to_html,
         _render_cms_plugin,
@@ -39,6 +57,7 @@ try:
         plugin_to_tag,
     )
     from tests.test_app.cms_plugins import DummyChildPlugin, DummyParentPlugin
+    from tests.test_app.models import CustomText
 
     try:
         from djangocms_transfer.exporter import export_page
@@ -171,7 +190,11 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
 
         add_url = response.url
 
-        with self.login_user_context(admin):
+        # Tokens carry a timestamp: keep it fixed while comparing the token with the rendered page
+        with (
+            self.login_user_context(admin),
+            patch("django.core.signing.TimestampSigner.timestamp", return_value=signing.b62_encode(1800000000)),
+        ):
             request = self.get_request()
             action_token = text_plugin_class.get_action_token(request, cms_plugin)
             response = self.client.get(add_url)
@@ -316,6 +339,58 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
         common_children_ids = _get_common_children_ids(text_plugin_copy_from, text_plugin_copy_to)
         self.assertFalse(common_children_ids)
 
+    @skipIf(not DJANGO_CMS4, "Plugin positions only exist on django CMS 4+")
+    def test_copy_referenced_plugins_in_bulk(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+
+        source = add_plugin(simple_placeholder, "TextPlugin", "en", body="Source")
+        for caption in ("Child plugin one", "Child plugin two"):
+            child = add_plugin(
+                simple_placeholder,
+                "PicturePlugin",
+                "en",
+                target=source,
+                picture=self.create_filer_image_object(),
+                caption_text=caption,
+            )
+            self.add_plugin_to_text(source, child)
+        destinations = [add_plugin(simple_placeholder, "TextPlugin", "en", body="Copy") for _ in range(3)]
+        own_child = add_plugin(simple_placeholder, "DummyChildPlugin", "en", target=destinations[1])
+        self.add_plugin_to_text(destinations[1], own_child)
+        for destination in destinations:
+            destination.refresh_from_db()
+            destination.body += "".join(plugin_to_tag(child) for child in source.cmsplugin_set.all())
+            destination.save()
+
+        with CaptureQueriesContext(connection) as few:
+            Text.copy_referenced_plugins_in_bulk(destinations[:1])
+        with CaptureQueriesContext(connection) as many:
+            Text.copy_referenced_plugins_in_bulk(destinations[1:])
+        # The number of queries does not depend on the number of text plugins
+        self.assertEqual(len(few), len(many))
+
+        self.assertEqual(source.cmsplugin_set.count(), 2)
+        source_children = set(source.cmsplugin_set.values_list("pk", flat=True))
+        for destination in destinations:
+            destination.refresh_from_db()
+            children = destination.cmsplugin_set.all()
+            ids_in_body = plugin_tags_to_id_list(destination.body)
+            self.assertEqual(set(ids_in_body), {child.pk for child in children})
+            self.assertFalse(source_children & set(ids_in_body))
+            for child in children:
+                if child.plugin_type == "PicturePlugin":
+                    self.assertTrue(child.get_bound_plugin().caption_text.startswith("Child plugin"))
+        self.assertIn(own_child.pk, plugin_tags_to_id_list(destinations[1].body))
+
+        plugins = list(simple_placeholder.get_plugins("en").order_by("position"))
+        self.assertEqual([plugin.position for plugin in plugins], list(range(1, len(plugins) + 1)))
+        for plugin in plugins:
+            if plugin.parent_id:
+                # Children directly follow their parent plugin (or its earlier children)
+                self.assertLess(CMSPlugin.objects.get(pk=plugin.parent_id).position, plugin.position)
+        self.assertEqual(plugins[-1].pk, destinations[-1].cmsplugin_set.order_by("position").last().pk)
+
     @skipIf(not DJANGO_CMS4, "Plugin positions only exist on django CMS 4+")
     def test_clean_plugins_keeps_positions_contiguous(self):
         """
@@ -380,6 +455,38 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
         remaining = positions()
         self.assertEqual(remaining, list(range(remaining[0], remaining[0] + len(remaining))))
 
+    @skipIf(not DJANGO_CMS4, "Plugin positions only exist on django CMS 4+")
+    def test_delete_plugins_in_bulk_removes_descendants(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Text plugin with children")
+        kept_plugin = add_plugin(simple_placeholder, "DummyChildPlugin", "en", target=text_plugin)
+        unbound_plugins = [
+            add_plugin(simple_placeholder, "DummyChildPlugin", "en", target=text_plugin) for _ in range(10)
+        ]
+        nested_plugin = add_plugin(simple_placeholder, "DummyChildPlugin", "en", target=unbound_plugins[0])
+        add_plugin(simple_placeholder, "TextPlugin", "en", body="Trailing sibling")
+
+        with CaptureQueriesContext(connection) as few:
+            text_plugin._delete_plugins_in_bulk(simple_placeholder, [unbound_plugins[1].pk])
+        with CaptureQueriesContext(connection) as many:
+            text_plugin._delete_plugins_in_bulk(simple_placeholder, [plugin.pk for plugin in unbound_plugins[2:]])
+
+        # The number of queries does not depend on the number of deleted plugins
+        for q in few.captured_queries:
+            print("FEW", q["sql"][:150])
+        for q in many.captured_queries:
+            print("MANY", q["sql"][:150])
+        self.assertEqual(len(few), len(many))
+
+        text_plugin._delete_plugins_in_bulk(simple_placeholder, [unbound_plugins[0].pk])
+
+        self.assertEqual(list(text_plugin.cmsplugin_set.values_list("pk", flat=True)), [kept_plugin.pk])
+        self.assertObjectDoesNotExist(CMSPlugin.objects.all(), pk=nested_plugin.pk)
+        remaining = list(simple_placeholder.get_plugins("en").values_list("position", flat=True))
+        self.assertEqual(remaining, list(range(1, len(remaining) + 1)))
+
     def test_add_and_cancel_child_plugin(self):
         """
         Test that you can add a text plugin
@@ -498,6 +605,80 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
 
         self.assertNotEqual(action_token_1, action_token_2)
 
+    def test_action_token_expires(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the first")
+        text_plugin_class = text_plugin.get_plugin_class_instance()
+
+        with self.login_user_context(self.get_superuser()):
+            request = self.get_request()
+            action_token = text_plugin_class.get_action_token(request, text_plugin)
+            form = ActionTokenValidationForm({"token": action_token})
+            self.assertTrue(form.is_valid())
+            session_key = request.session.session_key
+
+            self.assertEqual(form.get_token_data(session_key), (str(text_plugin.pk), str(simple_placeholder.pk)))
+            self.assertEqual(form.get_id_from_token(session_key), str(text_plugin.pk))
+            # Verified tokens are cached
+            self.assertGreaterEqual(_verify_action_token.cache_info().hits, 1)
+
+            with patch("djangocms_text.settings.TEXT_ACTION_TOKEN_MAX_AGE", -1):
+                self.assertIsNone(form.get_token_data(session_key))
+                self.assertFalse(form.get_id_from_token(session_key))
+                endpoint = self.get_custom_admin_url(TextPlugin, "render_plugin")
+                response = self.client.get(f"{endpoint}?token={action_token}&plugin=1")
+                self.assertEqual(response.status_code, 400)
+
+            # A tampered token is rejected, and not cached
+            cached_tokens = _verify_action_token.cache_info().currsize
+            form = ActionTokenValidationForm({"token": action_token[:-1]})
+            self.assertTrue(form.is_valid())
+            self.assertIsNone(form.get_token_data(session_key))
+            self.assertEqual(_verify_action_token.cache_info().currsize, cached_tokens)
+
+    def test_render_plugins_skips_text_plugin_lookup(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the first")
+        text_plugin_class = text_plugin.get_plugin_class_instance()
+        child = self._add_child_plugin(text_plugin, "LinkPlugin")
+        text_plugin = self.add_plugin_to_text(text_plugin, child)
+
+        with self.login_user_context(self.get_superuser()):
+            request = self.get_request()
+            action_token = text_plugin_class.get_action_token(request, text_plugin)
+            endpoint = self.get_custom_admin_url(TextPlugin, "render_plugin")
+            url = f"{endpoint}?token={action_token}&plugins={child.pk}"
+            self.client.get(url)  # Creates the user's CMS settings
+            # The session's user, the placeholder and its permission checks, the children and their
+            # downcast: the text plugin itself is not fetched
+            with self.assertNumQueries(8 if DJANGO_CMS4 else 13):
+                response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.json()["plugins"]), [str(child.pk)])
+
+    def test_render_plugin_only_renders_children_in_the_token_placeholder(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        other_placeholder = Placeholder.objects.create(slot="other")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the first")
+        child = self._add_child_plugin(text_plugin, "LinkPlugin")
+        text_plugin = self.add_plugin_to_text(text_plugin, child)
+
+        with self.login_user_context(self.get_superuser()):
+            request = self.get_request()
+            # A token of the text plugin's id, issued for another placeholder
+            signer = signing.TimestampSigner(salt=request.session.session_key)
+            action_token = signer.sign(f"{text_plugin.pk}:{other_placeholder.pk}")
+            endpoint = self.get_custom_admin_url(TextPlugin, "render_plugin")
+            batch_response = self.client.get(f"{endpoint}?token={action_token}&plugins={child.pk}")
+            response = self.client.get(f"{endpoint}?token={action_token}&plugin={child.pk}")
+
+        self.assertEqual(batch_response.json(), {"plugins": {}})
+        self.assertEqual(response.status_code, 204)
+
     def test_add_and_cancel_plugin_permissions(self):
         simple_page = self.create_page("test page", template="page.html", language="en")
         simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
@@ -754,6 +935,73 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
 
             self.assertEqual(force_str(response.content), rendered_child_plugin)
 
+    def test_render_child_plugins_in_batch(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the first")
+        other_text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the second")
+        text_plugin_class = text_plugin.get_plugin_class_instance()
+        children = [self._add_child_plugin(text_plugin, "LinkPlugin", data_suffix=i) for i in range(3)]
+        for child in children:
+            text_plugin = self.add_plugin_to_text(text_plugin, child)
+        foreign_child = self._add_child_plugin(other_text_plugin, "LinkPlugin")
+
+        with self.login_user_context(self.get_superuser()):
+            request = self.get_request()
+            action_token = text_plugin_class.get_action_token(request, text_plugin)
+            endpoint = self.get_custom_admin_url(TextPlugin, "render_plugin")
+            plugin_ids = ",".join(str(plugin.pk) for plugin in [*children, foreign_child])
+            response = self.client.get(f"{endpoint}?token={action_token}&plugins={plugin_ids}")
+
+            context = RequestContext(request)
+            context["request"] = request
+            expected = {
+                str(child.pk): plugin_to_tag(child, content=_render_cms_plugin(child, context), admin=True)
+                for child in children
+            }
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"plugins": expected})
+
+    def test_lazy_child_previews_are_not_rendered_in_form(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the first")
+        child_plugin = self._add_child_plugin(text_plugin, "LinkPlugin")
+        text_plugin = self.add_plugin_to_text(text_plugin, child_plugin)
+
+        with (
+            patch("djangocms_text.settings.TEXT_LAZY_CHILD_PREVIEWS", True),
+            patch("djangocms_text.utils._render_cms_plugin") as render,
+            self.login_user_context(self.get_superuser()),
+        ):
+            response = self.client.get(self.get_change_plugin_uri(text_plugin))
+
+        self.assertEqual(response.status_code, 200)
+        render.assert_not_called()
+        # The empty tag tells the editor which node type the preview will need
+        self.assertContains(response, escape(plugin_to_tag(child_plugin, admin=True, node="cmsPlugin")))
+
+    def test_lazy_child_previews_are_rendered_for_other_editors(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="I'm the first")
+        child_plugin = self._add_child_plugin(text_plugin, "LinkPlugin")
+        text_plugin = self.add_plugin_to_text(text_plugin, child_plugin)
+
+        # Only the Tiptap editor fetches the previews of empty plugin tags
+        with (
+            patch("djangocms_text.settings.TEXT_LAZY_CHILD_PREVIEWS", True),
+            patch("djangocms_text.cms_plugins.rte_config.name", "ckeditor4"),
+            patch("djangocms_text.utils._render_cms_plugin", return_value="Preview") as render,
+            self.login_user_context(self.get_superuser()),
+        ):
+            response = self.client.get(self.get_change_plugin_uri(text_plugin))
+
+        self.assertEqual(response.status_code, 200)
+        render.assert_called_once()
+        self.assertContains(response, escape(plugin_to_tag(child_plugin, content="Preview", admin=True)))
+
     def test_render_child_plugin_permissions(self):
         """
         Users can't render a child plugin without change permissions
@@ -864,6 +1112,36 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
             self.assertContains(response, DummyParentPlugin._ckeditor_body_class)
             self.assertContains(response, DummyChildPlugin.child_ckeditor_body_css_class)
 
+    def test_body_css_classes_of_static_parent_chain(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        outer_plugin = add_plugin(simple_placeholder, DummyChildPlugin, "en")
+        inner_plugin = add_plugin(simple_placeholder, DummyChildPlugin, "en", target=outer_plugin)
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Content", target=inner_plugin)
+        text_plugin = CMSPlugin.objects.get(pk=text_plugin.pk)
+        plugin_class = text_plugin.get_plugin_class_instance()
+
+        first = plugin_class._get_body_css_classes_from_parent_plugins(text_plugin)
+        hits = _get_static_body_css_classes.cache_info().hits
+        second = plugin_class._get_body_css_classes_from_parent_plugins(text_plugin)
+
+        self.assertEqual(first, " " + DummyChildPlugin.child_ckeditor_body_css_class)
+        self.assertEqual(second, first)
+        self.assertEqual(_get_static_body_css_classes.cache_info().hits, hits + 1)
+
+    def test_body_css_classes_without_plugin_tree_methods(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        outer_plugin = add_plugin(simple_placeholder, DummyParentPlugin, "en")
+        inner_plugin = add_plugin(simple_placeholder, DummyChildPlugin, "en", target=outer_plugin)
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Content", target=inner_plugin)
+        text_plugin = CMSPlugin.objects.get(pk=text_plugin.pk)
+
+        with patch.object(CMSPlugin, "get_ancestors", None), self.assertNumQueries(2):
+            parents = _get_parent_plugins(text_plugin)
+
+        self.assertEqual([parent.pk for parent in parents], [inner_plugin.pk, outer_plugin.pk])
+
     def test_render_plugin(self):
         simple_page = self.create_page("test page", template="page.html", language="en")
         simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
@@ -1002,13 +1280,146 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
             child_plugin_1_b.pk: child_plugin_2_b,
         }
 
-        TextPlugin.do_post_copy(text_plugin_2, source_map)
+        # Only the body column is updated: the body is not cleaned again
+        with patch("djangocms_text.models.clean_html") as clean_html, self.assertNumQueries(1):
+            TextPlugin.do_post_copy(text_plugin_2, source_map)
+        clean_html.assert_not_called()
 
         text_plugin_2.refresh_from_db()
         idlist = sorted(plugin_tags_to_id_list(text_plugin_2.body))
         expected = sorted([child_plugin_2_a.pk, child_plugin_2_b.pk])
         self.assertEqual(idlist, expected)
 
+    def _mock_djangocms_history(self):
+        """Just enough of djangocms-history (not a test requirement) for the operation callbacks"""
+        actions = types.ModuleType("djangocms_history.actions")
+        actions.ADD_PLUGIN, actions.DELETE_PLUGIN = "add_plugin", "delete_plugin"
+        helpers = types.ModuleType("djangocms_history.helpers")
+        helpers.get_bound_plugins = list
+        helpers.get_plugin_data = lambda plugin, only_meta=False: {"pk": plugin.pk, "only_meta": only_meta}
+        models = types.ModuleType("djangocms_history.models")
+        models.dump_json = json.dumps
+        return patch.dict(
+            sys.modules,
+            {
+                "djangocms_history": types.ModuleType("djangocms_history"),
+                "djangocms_history.actions": actions,
+                "djangocms_history.helpers": helpers,
+                "djangocms_history.models": models,
+            },
+        )
+
+    def test_history_pre_change_plugin_records_inline_plugins(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = self._add_text_plugin(simple_placeholder)
+        kept, deleted, added = [self._add_child_plugin(text_plugin, plugin_type="LinkPlugin") for _ in range(3)]
+        old_plugin = self.add_plugin_to_text(self.add_plugin_to_text(text_plugin, kept), deleted)
+        new_plugin = Text.objects.get(pk=text_plugin.pk)
+        new_plugin.body = f"{plugin_to_tag(kept)} {plugin_to_tag(added)}"
+        operation = MagicMock()
+
+        # One query for the old and new trees, one for the changed plugins
+        with self._mock_djangocms_history(), self.assertNumQueries(2):
+            TextPlugin.operation_handler_callbacks["pre_change_plugin"](
+                operation, old_plugin=old_plugin, new_plugin=new_plugin, placeholder=simple_placeholder
+            )
+
+        add_action, delete_action = (call.kwargs for call in operation.create_action.call_args_list)
+        self.assertEqual((add_action["action"], add_action["order"]), ("add_plugin", 2))
+        self.assertEqual(add_action["pre_data"], {"order": [kept.pk, deleted.pk], "parent_id": text_plugin.pk})
+        self.assertEqual(add_action["post_data"]["order"], [kept.pk, added.pk])
+        self.assertEqual(add_action["post_data"]["plugins"], [{"pk": added.pk, "only_meta": False}])
+        self.assertEqual((delete_action["action"], delete_action["order"]), ("delete_plugin", 3))
+        self.assertEqual(delete_action["pre_data"]["order"], [kept.pk, deleted.pk])
+        self.assertEqual(delete_action["pre_data"]["plugins"], [{"pk": deleted.pk, "only_meta": False}])
+        self.assertEqual(delete_action["post_data"]["order"], [kept.pk, added.pk])
+        self.assertEqual(delete_action["post_data"]["plugins"], [{"pk": deleted.pk, "only_meta": True}])
+
+        # Same inline plugins: nothing to record
+        operation = MagicMock()
+        with self._mock_djangocms_history(), self.assertNumQueries(0):
+            TextPlugin.operation_handler_callbacks["pre_change_plugin"](
+                operation, old_plugin=old_plugin, new_plugin=old_plugin, placeholder=simple_placeholder
+            )
+        operation.create_action.assert_not_called()
+
+    def test_history_post_add_plugin_records_inline_plugins(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = self._add_text_plugin(simple_placeholder)
+        children = [self._add_child_plugin(text_plugin, plugin_type="LinkPlugin") for _ in range(2)]
+        for child in children:
+            text_plugin = self.add_plugin_to_text(text_plugin, child)
+        operation = MagicMock()
+        actions = operation.actions.filter.return_value
+        actions.values_list.return_value.get.return_value = json.dumps({"plugins": [{"pk": text_plugin.pk}]})
+
+        # One query for the inline plugins, the recorded action is read and written by the queryset
+        with self._mock_djangocms_history(), self.assertNumQueries(1):
+            TextPlugin.operation_handler_callbacks["post_add_plugin"](operation, plugin=text_plugin)
+
+        operation.actions.filter.assert_called_once_with(action="add_plugin", order=1)
+        actions.values_list.assert_called_once_with("post_action_data", flat=True)
+        (_, kwargs) = actions.update.call_args
+        plugins = json.loads(kwargs["post_action_data"])["plugins"]
+        self.assertEqual(plugins[0], {"pk": text_plugin.pk})
+        self.assertEqual(sorted(plugin["pk"] for plugin in plugins[1:]), sorted(child.pk for child in children))
+
+        # No inline plugins: the recorded action is not touched
+        text_plugin = self._add_text_plugin(simple_placeholder)
+        operation = MagicMock()
+        with self._mock_djangocms_history(), self.assertNumQueries(0):
+            TextPlugin.operation_handler_callbacks["post_add_plugin"](operation, plugin=text_plugin)
+        operation.actions.filter.assert_not_called()
+
+    def test_copy_plugin_callback_in_bulk(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+
+        source_map = {}
+        copies = []
+        for _ in range(5):
+            source = self._add_text_plugin(simple_placeholder)
+            source_child = self._add_child_plugin(source, plugin_type="LinkPlugin")
+            source = self.add_plugin_to_text(source, source_child)
+
+            copied = add_plugin(simple_placeholder, "TextPlugin", "en", body=source.body)
+            source_map[source_child.pk] = self._add_child_plugin(copied, plugin_type="LinkPlugin")
+            copies.append(copied)
+        copies.append(self._add_text_plugin(simple_placeholder))  # no child plugins
+
+        # One query for all copied text plugins
+        with self.assertNumQueries(1):
+            TextPlugin.do_post_copy_in_bulk(copies, source_map)
+
+        for copied in copies[:-1]:
+            copied.refresh_from_db()
+            self.assertEqual(plugin_tags_to_id_list(copied.body), [copied.cmsplugin_set.get().pk])
+            self.assertEqual(copied.version, 2)
+
+    def test_copy_plugin_callback_remaps_in_memory(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+
+        source = self._add_text_plugin(simple_placeholder)
+        source_child = self._add_child_plugin(source, plugin_type="LinkPlugin")
+        source = self.add_plugin_to_text(source, source_child)
+        copied = add_plugin(simple_placeholder, "TextPlugin", "en", body=source.body)
+        source_map = {source_child.pk: self._add_child_plugin(copied, plugin_type="LinkPlugin")}
+
+        # The new plugins are taken from source_map: only the body is written
+        with self.assertNumQueries(1):
+            TextPlugin.do_post_copy(copied, source_map)
+
+        copied.refresh_from_db()
+        self.assertEqual(plugin_tags_to_id_list(copied.body), [copied.cmsplugin_set.get().pk])
+
+        # No child plugins, no query
+        text_plugin = self._add_text_plugin(simple_placeholder)
+        with self.assertNumQueries(0):
+            TextPlugin.do_post_copy(text_plugin, source_map)
+
     def test_plugin_tags_to_id_list(self):
         pairs = (
             ('<cms-plugin id="1"></cms-plugin><cms-plugin id="2"></cms-plugin>', [1, 2]),
@@ -1018,6 +1429,20 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
         for markup, expected in pairs:
             self.assertEqual(plugin_tags_to_id_list(markup), expected)
 
+    def test_inline_plugin_ids_are_memoized_per_body(self):
+        page = self.create_page("test page", template="page.html", language="en")
+        placeholder = self.get_placeholders(page, "en").get(slot="content")
+        plugin = add_plugin(placeholder, "TextPlugin", "en", body='<cms-plugin id="1"></cms-plugin>')
+
+        with patch("djangocms_text.models.plugin_tags_to_id_list", wraps=plugin_tags_to_id_list) as id_list:
+            self.assertEqual(plugin._get_inline_plugin_ids(), [1])
+            self.assertEqual(plugin._get_inline_plugin_ids(), [1])
+            self.assertEqual(id_list.call_count, 1)
+
+            plugin.body = '<cms-plugin id="2"></cms-plugin>'
+            self.assertEqual(plugin._get_inline_plugin_ids(), [2])
+            self.assertEqual(id_list.call_count, 2)
+
     def test_text_plugin_xss(self):
         page = self.create_page("test page", template="page.html", language="en")
         placeholder = self.get_placeholders(page, "en").get(slot="content")
@@ -1169,6 +1594,496 @@ class PluginActionsTestCase(TestFixture, BaseTestCase):
             ],
         )
 
+    def test_url_list_indents_child_pages(self):
+        parent = self.create_page("parent page", template="page.html", language="en")
+        self.create_page("child page", template="page.html", language="en", parent=parent)
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with self.login_user_context(self.superuser):
+            result = self.client.get(endpoint)
+
+        texts = [child["text"] for child in result.json()["results"][0]["children"]]
+        # EM SPACEs: the link picker does not collapse them
+        self.assertEqual(texts, ["parent page", "\u2003child page"])
+
+    def test_url_query_pagination(self):
+        self.create_page("about the test", template="page.html", language="en")
+        self.create_page("test page", template="page.html", language="en")
+        self.create_page("another test", template="page.html", language="en")
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with self.login_user_context(self.superuser):
+            first = self.client.get(endpoint + "?q=test&limit=2").json()
+            second = self.client.get(endpoint + "?q=test&limit=2&page=2").json()
+            invalid = self.client.get(endpoint + "?q=test&page=first")
+
+        # Titles starting with the search term come first
+        self.assertEqual([child["text"] for child in first["results"][0]["children"]], ["test page", "about the test"])
+        self.assertTrue(first["pagination"]["more"])
+        self.assertEqual([child["text"] for child in second["results"][0]["children"]], ["another test"])
+        self.assertFalse(second["pagination"]["more"])
+        self.assertEqual(invalid.status_code, 400)
+
+    def test_url_query_page_size_is_capped(self):
+        for index in range(3):
+            self.create_page(f"page {index}", template="page.html", language="en")
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with patch("djangocms_text.settings.TEXT_LINK_PAGE_SIZE", 2), self.login_user_context(self.superuser):
+            result = self.client.get(endpoint + "?limit=1000").json()
+
+        self.assertEqual(len(result["results"][0]["children"]), 2)
+        self.assertTrue(result["pagination"]["more"])
+
+    def test_url_query_snapshot_is_revalidated_by_etag(self):
+        self.create_page("snapshot page", template="page.html", language="en")
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with self.login_user_context(self.superuser):
+            response = self.client.get(endpoint)
+            etag = response["ETag"]
+            cached = self.client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+            self.create_page("another page", template="page.html", language="en")
+            changed = self.client.get(endpoint, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(cached.status_code, 304)
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], etag)
+        titles = [child["verbose"] for child in changed.json()["results"][0]["children"]]
+        self.assertIn("another page", titles)
+
+    def test_url_query_includes_link_providers(self):
+        from django.contrib.auth.models import User
+
+        from djangocms_text import links
+
+        User.objects.create(username="xylophone")
+        provider = links.LinkProvider("auth.user", search_fields=("username",), url_builder=lambda obj: "/users/")
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with patch.dict(links.link_providers, {"auth.user": provider}), self.login_user_context(self.superuser):
+            result = self.client.get(endpoint + "?q=xylo").json()
+            user = User.objects.get(username="xylophone")
+            reference = self.client.get(endpoint + f"?g=auth.user:{user.pk}").json()
+
+        self.assertEqual(
+            result["results"][-1]["children"],
+            [{"text": "xylophone", "url": "/users/", "id": f"auth.user:{user.pk}", "verbose": "xylophone"}],
+        )
+        self.assertEqual(reference, {"text": "xylophone", "url": "/users/"})
+
+    def test_url_query_skips_link_providers_without_view_permission(self):
+        from django.contrib.auth.models import User
+
+        from djangocms_text import links
+
+        User.objects.create(username="xylophone")
+        provider = links.LinkProvider("auth.user", search_fields=("username",))
+        user = self.get_staff_user_with_no_permissions()
+        self._give_permission(user, Text, "view")
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with patch.dict(links.link_providers, {"auth.user": provider}):
+            with self.login_user_context(user):
+                denied = self.client.get(endpoint + "?q=xylo").json()
+            self._give_permission(user, User, "change")
+            user = User.objects.get(pk=user.pk)  # reset the permission cache
+            with self.login_user_context(user):
+                allowed = self.client.get(endpoint + "?q=xylo").json()
+
+        self.assertNotIn("Users", [group["text"] for group in denied["results"]])
+        self.assertIn("Users", [group["text"] for group in allowed["results"]])
+
+    def test_url_query_resolves_references_in_bulk(self):
+        pages = [self.create_page(f"bulk page {index}", template="page.html", language="en") for index in range(3)]
+        references = [f"cms.page:{page.pk}" for page in pages]
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+        query = urlencode({"refs": ",".join([*references, "cms.page:0", "no.model:1", "invalid"])})
+
+        with self.login_user_context(self.superuser), CaptureQueriesContext(connection) as queries:
+            result = self.client.get(f"{endpoint}?{query}").json()["results"]
+
+        self.assertEqual([result[reference]["text"] for reference in references], [f"bulk page {i}" for i in range(3)])
+        self.assertEqual(result[references[0]]["url"], pages[0].get_absolute_url("en"))
+        self.assertIn("error", result["cms.page:0"])
+        self.assertIn("error", result["no.model:1"])
+        self.assertIn("error", result["invalid"])
+        # The titles of all pages are read with one query
+        title_model = apps.get_model("cms", "PageContent" if DJANGO_CMS4 else "Title")
+        title_table = connection.ops.quote_name(title_model._meta.db_table)
+        self.assertEqual(len([query for query in queries.captured_queries if title_table in query["sql"]]), 1)
+
+    def test_url_query_resolves_references_with_model_permissions(self):
+        page = self.create_page("bulk page", template="page.html", language="en")
+        user = self.get_staff_user_with_no_permissions()
+        user.user_permissions.add(Permission.objects.get(codename="view_text"))
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with self.login_user_context(user):
+            result = self.client.get(f"{endpoint}?refs=cms.page:{page.pk}").json()["results"]
+
+        self.assertEqual(result, {f"cms.page:{page.pk}": {"error": "Permission denied"}})
+
+        # As in the Django admin, the change permission implies the view permission
+        user.user_permissions.add(Permission.objects.get(codename="change_page"))
+        user = type(user).objects.get(pk=user.pk)  # reset the permission cache
+        with self.login_user_context(user):
+            result = self.client.get(f"{endpoint}?refs=cms.page:{page.pk}").json()["results"]
+            single = self.client.get(f"{endpoint}?g=cms.page:{page.pk}").json()
+
+        self.assertEqual(result[f"cms.page:{page.pk}"]["text"], "bulk page")
+        self.assertEqual(single["text"], "bulk page")
+
+    def test_url_resolution_checks_model_permissions(self):
+        page = self.create_page("test page", template="page.html", language="en")
+        user = self.get_staff_user_with_no_permissions()
+        user.user_permissions.add(Permission.objects.get(codename="view_text"))
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+
+        with self.login_user_context(user):
+            result = self.client.get(endpoint + f"?g=cms.page:{page.pk}").json()
+
+        self.assertEqual(result, {"error": "Permission denied"})
+
+    def test_url_query_resolves_references_with_string_keys(self):
+        from django.contrib.sessions.models import Session
+
+        session = Session.objects.create(session_key="a-session-key", session_data="", expire_date=timezone.now())
+        endpoint = admin_reverse("djangocms_text_textplugin_get_available_urls")
+        query = urlencode({"refs": "sessions.session:a-session-key,sessions.session:missing,cms.page:abc"})
+
+        with self.login_user_context(self.superuser):
+            result = self.client.get(f"{endpoint}?{query}").json()["results"]
+
+        self.assertEqual(result["sessions.session:a-session-key"], {"text": str(session), "url": ""})
+        self.assertEqual(result["sessions.session:missing"], {"error": "Reference not found"})
+        self.assertEqual(result["cms.page:abc"], {"error": "Invalid reference"})
+
+    def test_child_plugin_menu_is_cached(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Content")
+        plugin_class = text_plugin.get_plugin_class_instance()
+        clear_child_plugin_menus()
+
+        with patch.object(TextPlugin, "get_child_classes", wraps=plugin_class.get_child_classes) as get_child_classes:
+            first = plugin_class.get_plugins(text_plugin)
+            second = plugin_class.get_plugins(text_plugin)
+            with self.settings(CMS_PLACEHOLDER_CONF={}):
+                plugin_class.get_plugins(text_plugin)
+
+        self.assertEqual(first, second)
+        self.assertIn("LinkPlugin", [entry["value"] for entry in first])
+        self.assertEqual(get_child_classes.call_count, 2)
+
+    def test_child_plugin_menu_cache_evicts_oldest_entry(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Content")
+        plugin_class = text_plugin.get_plugin_class_instance()
+        clear_child_plugin_menus()
+        self.addCleanup(clear_child_plugin_menus)
+
+        with patch("djangocms_text.cms_plugins._CHILD_PLUGIN_MENU_CACHE_SIZE", 1):
+            for language in ("en", "de", "en"):
+                with override(language):
+                    plugin_class.get_plugins(text_plugin)
+
+        self.assertEqual(len(_child_plugin_menus), 1)
+        self.assertEqual(next(iter(_child_plugin_menus))[4], "en")
+
+    def test_child_plugin_menu_without_template_for_conf(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Content")
+        plugin_class = text_plugin.get_plugin_class_instance()
+        clear_child_plugin_menus()
+        self.addCleanup(clear_child_plugin_menus)
+        # django CMS 3.11 and 4.1.0 have no CMSPluginBase._get_template_for_conf()
+        if "_get_template_for_conf" in vars(CMSPluginBase):
+            self.addCleanup(setattr, CMSPluginBase, "_get_template_for_conf", CMSPluginBase._get_template_for_conf)
+            del CMSPluginBase._get_template_for_conf
+
+        with patch.object(TextPlugin, "get_child_classes", return_value=["LinkPlugin"]):
+            menu = plugin_class.get_plugins(text_plugin)
+            self.assertEqual(plugin_class.get_plugins(text_plugin), menu)
+
+        self.assertEqual([entry["value"] for entry in menu], ["LinkPlugin"])
+
+    def test_plain_text_and_excerpt_are_saved(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(
+            simple_placeholder, "TextPlugin", "en", body="<p>Caf&eacute; <b>au</b>\n lait &amp; cr&shy;oissant</p>"
+        )
+        text_plugin = Text.objects.get(pk=text_plugin.pk)
+
+        self.assertEqual(text_plugin.plain_text, "Café au lait & croissant")
+        self.assertEqual(text_plugin.excerpt, "Café au lait...")
+        self.assertEqual(str(text_plugin), "Café au lait...")
+
+        text_plugin.body = "<p>Changed</p>"
+        text_plugin.save(update_fields=["position"])
+        text_plugin.refresh_from_db()
+        self.assertEqual((text_plugin.plain_text, text_plugin.excerpt), ("Changed", "Changed"))
+
+    def test_empty_excerpt_is_not_recomputed(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p><br></p>")
+        text_plugin = Text.objects.get(pk=text_plugin.pk)
+
+        with patch("djangocms_text.models.get_plain_text") as plain_text:
+            self.assertEqual(str(text_plugin), "")
+        plain_text.assert_not_called()
+
+    def test_backfill_plain_text_command(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugins = [
+            add_plugin(simple_placeholder, "TextPlugin", "en", body=f"<p>Text number {i}</p>") for i in range(3)
+        ]
+        Text.objects.update(plain_text="", excerpt="", content_hash="", modified=None)
+
+        output = io.StringIO()
+        call_command("text_backfill_plain_text", batch_size=2, stdout=output)
+
+        self.assertEqual(output.getvalue().strip(), "Updated 3 text plugin(s).")
+        for i, text_plugin in enumerate(text_plugins):
+            text_plugin.refresh_from_db()
+            self.assertEqual(text_plugin.plain_text, f"Text number {i}")
+            self.assertEqual(text_plugin.excerpt, f"Text number {i}")
+            self.assertIsNotNone(text_plugin.modified)
+
+    def test_iter_changes(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        unchanged = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Unchanged</p>")
+        changed = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Before</p>")
+        restyled = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Restyled</p>")
+        self.assertEqual([change[0] for change in Text.iter_changes()], [unchanged.pk, changed.pk, restyled.pk])
+
+        cursor = timezone.now()
+        changed.body = "<p>After</p>"
+        changed.save()
+        # Markup-only changes do not change the plain text
+        modified = restyled.modified
+        restyled.body = "<p><b>Restyled</b></p>"
+        restyled.save()
+        self.assertEqual(restyled.modified, modified)
+
+        self.assertEqual(
+            list(Text.iter_changes(since=cursor, chunk_size=1, overlap=timedelta(0))),
+            [(changed.pk, "en", simple_placeholder.pk, "After")],
+        )
+
+    def test_iter_changes_rereads_late_commits(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Late</p>")
+        # Saved before the cursor was taken, but committed afterwards
+        cursor = text_plugin.modified + timedelta(seconds=60)
+
+        self.assertEqual([change[0] for change in Text.iter_changes(since=cursor)], [text_plugin.pk])
+        with patch("djangocms_text.models.settings.TEXT_CHANGE_FEED_OVERLAP", 30):
+            self.assertEqual(list(Text.iter_changes(since=cursor)), [])
+
+    def test_plain_text_is_computed_once_on_insert(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+
+        with patch("djangocms_text.models.get_plain_text", wraps=get_plain_text) as plain_text:
+            add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Once</p>")
+        plain_text.assert_called_once_with("<p>Once</p>")
+
+    def test_inline_patch_save(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(
+            simple_placeholder,
+            "TextPlugin",
+            "en",
+            body="<p>One</p><p>Two</p><p>Three</p>",
+            json={"type": "doc", "content": [{"n": 1}, {"n": 2}, {"n": 3}]},
+        )
+        endpoint = self.get_change_plugin_uri(text_plugin)
+
+        patch_data = {
+            "version": text_plugin.get_body_version(),
+            "length": 3,
+            "start": 1,
+            "delete": 1,
+            "insert": ["<p>2<script>alert(1)</script></p>", "<p>2.5</p>"],
+            "hashes": [get_block_hash(block) for block in ("<p>One</p>", "<p>Two</p>", "<p>Three</p>")],
+            "json_insert": [{"n": 2}, {"n": 2.5}],
+        }
+        superuser = self.get_superuser()
+        with (
+            self.login_user_context(superuser),
+            patch("djangocms_text.cms_plugins.settings.TEXT_INLINE_PATCH_SAVE", True),
+        ):
+            with patch("djangocms_text.models.clean_html", wraps=clean_html) as clean:
+                response = self.client.post(endpoint, {"body_patch": json.dumps(patch_data)})
+            # Only the inserted blocks are sanitized
+            clean.assert_called_once_with("<p>2<script>alert(1)</script></p><p>2.5</p>")
+            text_plugin.refresh_from_db()
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(text_plugin.body, "<p>One</p><p>2</p><p>2.5</p><p>Three</p>")
+            self.assertEqual(text_plugin.json["content"], [{"n": 1}, {"n": 2}, {"n": 2.5}, {"n": 3}])
+            self.assertEqual(response["X-Text-Version"], text_plugin.get_body_version())
+
+            # The stale version is rejected
+            response = self.client.post(endpoint, {"body_patch": json.dumps(patch_data)})
+            self.assertEqual(response.status_code, 409)
+            text_plugin.refresh_from_db()
+            self.assertEqual(text_plugin.body, "<p>One</p><p>2</p><p>2.5</p><p>Three</p>")
+
+    def test_inline_patch_save_checks_block_hashes(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        # Stored sanitized and hyphenated, the editor has the plain HTML and the child plugin's preview
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>One</p><p>Two</p>")
+        text_plugin.body = '<p>On&shy;e <cms-plugin id="99999"></cms-plugin></p><p>Two</p>'
+        Text.objects.filter(pk=text_plugin.pk).update(body=text_plugin.body)
+        endpoint = self.get_change_plugin_uri(text_plugin)
+        patch_data = {
+            "version": text_plugin.get_body_version(),
+            "length": 2,
+            "start": 1,
+            "delete": 1,
+            "insert": ["<p>2</p>"],
+        }
+
+        with (
+            self.login_user_context(self.get_superuser()),
+            patch("djangocms_text.cms_plugins.settings.TEXT_INLINE_PATCH_SAVE", True),
+        ):
+            # The editor's blocks do not match the stored blocks
+            patch_data["hashes"] = [get_block_hash("<p>One</p>"), get_block_hash("<p>Zwei</p>")]
+            response = self.client.post(endpoint, {"body_patch": json.dumps(patch_data)})
+            self.assertEqual(response.status_code, 409)
+            self.assertEqual(Text.objects.get(pk=text_plugin.pk).body, text_plugin.body)
+
+            # A rejected patch does not affect the next request
+            patch_data["hashes"] = [
+                get_block_hash('<p>One <cms-plugin id="99999"><a href="/">Link</a></cms-plugin></p>'),
+                get_block_hash("<p>Two</p>"),
+            ]
+            response = self.client.post(endpoint, {"body_patch": json.dumps(patch_data)})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                Text.objects.get(pk=text_plugin.pk).body, '<p>On&shy;e <cms-plugin id="99999"></cms-plugin></p><p>2</p>'
+            )
+
+    def test_version_detects_concurrent_saves(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Original</p>")
+        first, second = Text.objects.get(pk=text_plugin.pk), Text.objects.get(pk=text_plugin.pk)
+
+        first.body = "<p>First</p>"
+        first.save()
+        self.assertEqual(first.version, text_plugin.version + 1)
+
+        second.body = "<p>Second</p>"
+        with self.assertRaises(TextVersionConflict), transaction.atomic():
+            second.save()
+        self.assertEqual(second.version, text_plugin.version)
+        self.assertEqual(Text.objects.get(pk=text_plugin.pk).body, "<p>First</p>")
+
+    def test_change_form_rejects_stale_version(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Original</p>")
+        endpoint = self.get_change_plugin_uri(text_plugin)
+        stale_version = text_plugin.version
+        text_plugin.save()
+
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.post(endpoint, {"body": "<p>Overwritten</p>", "version": stale_version})
+            self.assertContains(response, "The text has been changed in the meantime.")
+            response = self.client.post(endpoint, {"body": "<p>Changed</p>", "version": stale_version + 1})
+
+        self.assertEqual(response["X-Text-Version"], str(stale_version + 2))
+        self.assertEqual(Text.objects.get(pk=text_plugin.pk).body, "<p>Changed</p>")
+
+    def test_custom_text_model_without_text_fields(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "CustomTextPlugin", "en", body="<p>Custom text</p>")
+        endpoint = self.get_change_plugin_uri(text_plugin)
+
+        self.assertEqual(str(text_plugin), "Custom text")
+        with self.login_user_context(self.get_superuser()):
+            response = self.client.get(endpoint)
+            self.assertEqual(response.status_code, 200)
+            response = self.client.post(endpoint, {"body": "<p>Changed</p>", "version": "1"})
+            self.assertEqual(response.status_code, 200)
+
+        text_plugin = CustomText.objects.get(pk=text_plugin.pk)
+        self.assertEqual(text_plugin.body, "<p>Changed</p>")
+        # Inline patches are based on a hash of the body instead of the version
+        text_plugin.apply_body_patch(
+            {
+                "version": text_plugin.get_body_version(),
+                "start": 0,
+                "delete": 1,
+                "insert": ["<p>Patched</p>"],
+                "length": 1,
+                "hashes": [get_block_hash("<p>Changed</p>")],
+            }
+        )
+        text_plugin.save()
+        self.assertEqual(CustomText.objects.get(pk=text_plugin.pk).body, "<p>Patched</p>")
+
+    def test_modal_form_rejects_concurrent_save(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        text_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="<p>Original</p>")
+        endpoint = self.get_change_plugin_uri(text_plugin)
+
+        with self.login_user_context(self.get_superuser()):
+            # Two editors open the modal form
+            forms = [self.client.get(endpoint).content.decode() for _ in range(2)]
+            versions = [re.search(r'<input[^>]*name="version"[^>]*>', form).group() for form in forms]
+            versions = [re.search(r'value="(\d+)"', version).group(1) for version in versions]
+            self.assertEqual(versions, [str(text_plugin.version)] * 2)
+
+            response = self.client.post(endpoint, {"body": "<p>First</p>", "version": versions[0]})
+            self.assertEqual(response.status_code, 200)
+            response = self.client.post(endpoint, {"body": "<p>Second</p>", "version": versions[1]})
+
+        self.assertContains(response, "The text has been changed in the meantime.")
+        self.assertEqual(Text.objects.get(pk=text_plugin.pk).body, "<p>First</p>")
+
+    def test_delete_ghost_plugins_command(self):
+        simple_page = self.create_page("test page", template="page.html", language="en")
+        simple_placeholder = self.get_placeholders(simple_page, "en").get(slot="content")
+        kept_plugin = add_plugin(simple_placeholder, "TextPlugin", "en", body="Saved text")
+
+        with self.login_user_context(self.get_superuser()):
+            ghost_pks = [
+                self.get_plugin_id_from_response(
+                    self.client.get(self.get_add_plugin_uri(simple_placeholder, "TextPlugin"))
+                )
+                for _ in range(3)
+            ]
+        ghost_child = add_plugin(
+            simple_placeholder, "DummyChildPlugin", "en", target=CMSPlugin.objects.get(pk=ghost_pks[0])
+        )
+        CMSPlugin.objects.filter(pk__in=ghost_pks[:2]).update(creation_date=timezone.now() - timedelta(days=2))
+
+        output = io.StringIO()
+        call_command("text_delete_ghost_plugins", stdout=output)
+
+        self.assertEqual(output.getvalue().strip(), "Deleted 2 ghost text plugin(s).")
+        remaining = CMSPlugin.objects.filter(placeholder=simple_placeholder, language="en")
+        self.assertEqual(set(remaining.values_list("pk", flat=True)), {kept_plugin.pk, int(ghost_pks[2])})
+        self.assertObjectDoesNotExist(CMSPlugin.objects.all(), pk=ghost_child.pk)
+        if DJANGO_CMS4:
+            self.assertEqual(sorted(remaining.values_list("position", flat=True)), [1, 2])
+
     def test_get_messages(self):
         endpoint = admin_reverse("djangocms_text_textplugin_get_messages")
 
@@ -1301,6 +2216,24 @@ class DjangoCMSTranslationsIntegrationTestCase(BaseTestCase):
         result = TextPlugin.set_translation_import_content(result, plugin)
         self.assertDictEqual(result, {child1.pk: ""})
 
+    def test_textfields_in_bulk(self):
+        parents = [add_plugin(self.placeholder, "TextPlugin", "en", body="") for _ in range(2)]
+        for i, parent in enumerate(parents, start=1):
+            child = add_plugin(self.placeholder, "DummyLinkPlugin", "en", target=parent, label=f"LINK{i}")
+            parent.body = f'<p>Go to <cms-plugin alt="Link" title="Link" id="{child.pk}"></cms-plugin></p>'
+            parent.save()
+
+        plugins = self._export_page()[0]["plugins"]
+        plugin_data_list = [plugin["data"] for plugin in plugins if plugin["plugin_type"] == "TextPlugin"]
+        results = TextPlugin.get_translation_export_contents("body", plugin_data_list)
+
+        self.assertEqual(
+            results,
+            [TextPlugin.get_translation_export_content("body", plugin_data) for plugin_data in plugin_data_list],
+        )
+        imported = TextPlugin.set_translation_import_contents([(content, None) for content, _ in results])
+        self.assertEqual([list(result.values()) for result in imported], [["LINK1"], ["LINK2"]])
+
 
 @skipIf(SKIP_CMS_TEST, "Skipping tests because djangocms is not installed")
 class TestGetChildPluginCandidates(BaseTestCase):